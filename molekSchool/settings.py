@@ -135,6 +135,9 @@ if "sqlite" in DB_ENGINE:
             "NAME": BASE_DIR / config("DB_NAME", default="db.sqlite3"),
         }
     }
+    # Covering-index INCLUDE columns are PostgreSQL-only; SQLite builds the
+    # same index without them
+    SILENCED_SYSTEM_CHECKS = ["models.W040"]
 else:
     # PostgreSQL configuration (production)
     DATABASES = {
@@ -154,6 +157,26 @@ else:
         }
     }
 
+# Rows per INSERT statement for CSV score uploads and student bulk enrollment
+BULK_BATCH_SIZE = config("MOLEK_BULK_BATCH", default=500, cast=int)
+
+# ==============================================================================
+# PASSWORD HASHING
+# ==============================================================================
+# Argon2 (argon2-cffi, C implementation) for new hashes, with explicit cost
+# parameters (see users/hashers.py). The PBKDF2 hashers stay listed so existing
+# hashes still verify and are upgraded on next login.
+PASSWORD_HASHERS = [
+    "users.hashers.MolekArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Threads hashing passwords in parallel during a student bulk upload. Each
+# Argon2 hash holds its full memory_cost while it runs, so keep this small.
+PASSWORD_HASH_WORKERS = config("MOLEK_PASSWORD_HASH_WORKERS", default=2, cast=int)
+
 # ==============================================================================
 # PASSWORD VALIDATION
 # ==============================================================================
@@ -195,7 +218,7 @@ AUTH_USER_MODEL = "users.UserProfile"
 # ==============================================================================
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -1,9 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django import forms
-import re
 
 from .models import (
+    ADMIN_ROLES,
     UserProfile,
     AcademicSession,
     Term,
@@ -14,6 +14,7 @@ from .models import (
     ExamResult,
     PromotionRule,
 )
+from .utils import PHONE_NUMBER_RE
 
 
 # ==============================================================================
@@ -28,13 +29,13 @@ class UserProfileAdminForm(forms.ModelForm):
 
     def clean_phone_number(self):
         phone_number = self.cleaned_data.get('phone_number')
-        if phone_number and not re.match(r'^\+?1?\d{9,15}$', phone_number):
+        if phone_number and not PHONE_NUMBER_RE.match(phone_number):
             raise forms.ValidationError('Invalid phone number format')
         return phone_number
 
     def clean_role(self):
         role = self.cleaned_data.get('role')
-        if role not in ['admin', 'superadmin']:
+        if role not in ADMIN_ROLES:
             raise forms.ValidationError('Role must be admin or superadmin')
         return role
 
@@ -48,7 +49,7 @@ class UserProfileAdmin(UserAdmin):
         'is_active', 'is_staff', 'created_at'
     )
     list_filter = ('role', 'is_active', 'is_staff', 'sex')
-    search_fields = ('username', 'email', 'first_name', 'last_name')
+    search_fields = ('username', 'email', 'full_name')
     readonly_fields = ('created_at', 'updated_at')
     ordering = ('-created_at',)
 
@@ -81,14 +82,14 @@ class UserProfileAdmin(UserAdmin):
 
     def save_model(self, request, obj, form, change):
         """Auto-set is_staff for admins/superadmins"""
-        if obj.role in ['admin', 'superadmin']:
+        if obj.role in ADMIN_ROLES:
             obj.is_staff = True
         super().save_model(request, obj, form, change)
 
     def get_queryset(self, request):
         """Only show admin/superadmin users"""
         qs = super().get_queryset(request)
-        return qs.filter(role__in=['admin', 'superadmin'])
+        return qs.filter(role__in=ADMIN_ROLES)
 
 
 # ==============================================================================
@@ -141,7 +142,7 @@ class ActiveStudentAdmin(admin.ModelAdmin):
         'is_active', 'created_at'
     )
     list_filter = ('class_level', 'gender', 'is_active', 'enrollment_session')
-    search_fields = ('admission_number', 'first_name', 'last_name', 'email')
+    search_fields = ('admission_number', 'full_name', 'email')
     filter_horizontal = ('subjects',)
     ordering = ('admission_number',)
     readonly_fields = ('admission_number', 'password_hash', 'created_at', 'updated_at')
@@ -178,6 +179,10 @@ class ActiveStudentAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Avoid per-row class level lookups in list_display"""
+        return super().get_queryset(request).for_list()
+
 
 # ==============================================================================
 # CA SCORE ADMIN (CA1 + CA2)
@@ -197,8 +202,7 @@ class CAScoreAdmin(admin.ModelAdmin):
     list_filter = ('session', 'term', 'subject', 'student__class_level')
     search_fields = (
         'student__admission_number',
-        'student__first_name',
-        'student__last_name',
+        'student__full_name',
         'subject__name'
     )
     ordering = ('-updated_at',)
@@ -219,6 +223,10 @@ class CAScoreAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Avoid per-row student lookups in list_display"""
+        return super().get_queryset(request).for_display()
+
     @admin.display(description='Admission No.', ordering='student__admission_number')
     def get_admission_number(self, obj):
         return obj.student.admission_number
@@ -259,8 +267,7 @@ class ExamResultAdmin(admin.ModelAdmin):
     list_filter = ('session', 'term', 'grade', 'subject', 'student__class_level')
     search_fields = (
         'student__admission_number',
-        'student__first_name',
-        'student__last_name',
+        'student__full_name',
         'subject__name'
     )
     ordering = ('-uploaded_at',)
@@ -314,6 +321,10 @@ class ExamResultAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Avoid per-row student lookups in list_display"""
+        return super().get_queryset(request).for_display()
+
     @admin.display(description='Admission No.', ordering='student__admission_number')
     def get_admission_number(self, obj):
         return obj.student.admission_number
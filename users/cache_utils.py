@@ -149,9 +149,10 @@ def get_cached_sessions():
     from .models import AcademicSession
     
     key = make_cache_key('sessions', 'all')
+    # Terms are cached with their sessions - the list serializer nests them
     return get_or_set_cache(
         key,
-        lambda: list(AcademicSession.objects.all().order_by('-start_date')),
+        lambda: list(AcademicSession.objects.with_terms().order_by('-start_date')),
         timeout=CACHE_TIMEOUT_ACADEMIC
     )
 
@@ -202,7 +203,7 @@ def get_cached_subjects(is_active=True):
     key = make_cache_key('subjects', 'active' if is_active else 'all')
     
     def fetch_subjects():
-        queryset = Subject.objects.prefetch_related('class_levels')
+        queryset = Subject.objects.with_levels()
         if is_active:
             queryset = queryset.filter(is_active=True)
         return list(queryset.order_by('name'))
@@ -210,6 +211,63 @@ def get_cached_subjects(is_active=True):
     return get_or_set_cache(key, fetch_subjects, timeout=CACHE_TIMEOUT_ACADEMIC)
 
 
+# Only what authentication, permissions and log lines read; credential
+# columns (password) must never be written to the cache
+CACHED_USER_FIELDS = ('id', 'username', 'role', 'is_active')
+
+
+def _load_user_auth_row(user_id):
+    from rest_framework_simplejwt.settings import api_settings
+    from rest_framework_simplejwt.utils import get_md5_hash_password
+    from .models import UserProfile
+    
+    if not api_settings.CHECK_REVOKE_TOKEN:
+        return UserProfile.objects.filter(pk=user_id).values(*CACHED_USER_FIELDS).first()
+    row = UserProfile.objects.filter(pk=user_id).values(*CACHED_USER_FIELDS, 'password').first()
+    if row is not None:
+        # Keep the token's revoke claim (already inside every JWT issued),
+        # never the hash itself
+        row['revoke_claim'] = get_md5_hash_password(row.pop('password'))
+    return row
+
+
+def get_cached_user(user_id):
+    """
+    Get the admin user a JWT was issued to from cache or database.
+    
+    Only CACHED_USER_FIELDS are cached, so the returned UserProfile is a
+    partial instance: any other field (email, first_name, password, ...)
+    is deferred and costs a query on first read. request.user call sites
+    only read these fields or its pk (created_by/uploaded_by); ProfileView
+    loads the full row and ChangePasswordView saves update_fields=['password'].
+    
+    Keyed per user rather than per token (sha256 of the access token), so
+    the UserProfile signals can invalidate a role, is_active or password
+    change for every outstanding token at once.
+    """
+    from .models import UserProfile
+    
+    key = make_cache_key('user', user_id)
+    # Saves and deletes invalidate through signals; the short timeout
+    # bounds how long a queryset.update() can go unseen
+    row = get_or_set_cache(
+        key,
+        lambda: _load_user_auth_row(user_id),
+        timeout=CACHE_TIMEOUT_SHORT
+    )
+    if row is None:
+        return None
+    # from_db() expects the loaded values in model field order
+    field_names = [
+        f.attname for f in UserProfile._meta.concrete_fields if f.attname in row
+    ]
+    user = UserProfile.from_db(
+        UserProfile.objects.db, field_names, [row[name] for name in field_names]
+    )
+    user.revoke_claim = row.get('revoke_claim')
+    return user
+
+
 def invalidate_session_cache():
     """Invalidate all session-related cache"""
     invalidate_cache(
@@ -220,7 +278,8 @@ def invalidate_session_cache():
 
 def invalidate_term_cache(session_id=None):
     """Invalidate term cache"""
-    keys = [make_cache_key('terms', 'all')]
+    # The cached session list carries each session's terms
+    keys = [make_cache_key('terms', 'all'), make_cache_key('sessions', 'all')]
     if session_id:
         keys.append(make_cache_key('terms', session_id))
     invalidate_cache(*keys)
@@ -239,6 +298,11 @@ def invalidate_subject_cache():
     )
 
 
+def invalidate_user_cache(user_id):
+    """Invalidate a cached admin user"""
+    invalidate_cache(make_cache_key('user', user_id))
+
+
 def invalidate_student_cache(student_id=None, class_level=None):
     """Invalidate student-related cache"""
     keys = [make_list_cache_key('students')]
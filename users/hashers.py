@@ -0,0 +1,16 @@
+"""
+Password hashers for the Molek school backend.
+"""
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class MolekArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with pinned cost parameters (OWASP minimum: 19 MiB, t=2, p=1).
+
+    Keeps the ``argon2`` algorithm name, so hashes made with the library
+    defaults still verify and are re-hashed on the next successful login.
+    """
+    time_cost = 2
+    memory_cost = 19456  # KiB
+    parallelism = 1
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:45
+
+from django.db import migrations, models
+
+from users.utils import grade_case_sql
+
+
+# Terms are matched by name here; 0010_term_ordinal recreates the view
+# keyed on Term.ordinal (utils.student_cumulative_view_sql)
+CREATE_VIEW_SQL = f"""
+CREATE MATERIALIZED VIEW mv_student_cumulative AS
+SELECT
+    er.student_id,
+    er.subject_id,
+    er.session_id,
+    MAX(CASE WHEN t.name = 'First Term' THEN er.total_score END) AS first_term_total,
+    MAX(CASE WHEN t.name = 'Second Term' THEN er.total_score END) AS second_term_total,
+    MAX(CASE WHEN t.name = 'Third Term' THEN er.total_score END) AS third_term_total,
+    ROUND(AVG(er.total_score), 2) AS cumulative_score,
+    {grade_case_sql('AVG(er.total_score)')} AS cumulative_grade
+FROM users_examresult er
+JOIN users_term t ON t.id = er.term_id
+GROUP BY er.student_id, er.subject_id, er.session_id
+WITH DATA;
+
+CREATE UNIQUE INDEX mv_student_cumulative_uniq
+    ON mv_student_cumulative (student_id, subject_id, session_id);
+CREATE INDEX mv_student_cumulative_student_session_idx
+    ON mv_student_cumulative (student_id, session_id);
+CREATE INDEX mv_student_cumulative_session_subject_idx
+    ON mv_student_cumulative (session_id, subject_id);
+"""
+
+DROP_VIEW_SQL = "DROP MATERIALIZED VIEW IF EXISTS mv_student_cumulative;"
+
+
+def create_view(apps, schema_editor):
+    # Materialized views are PostgreSQL only; other backends fall back to
+    # aggregating ExamResult directly (see utils.get_student_cumulative).
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_VIEW_SQL)
+
+
+def drop_view(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_VIEW_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_remove_promotionrule_category_pass_marks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentCumulative',
+            fields=[
+                ('pk', models.CompositePrimaryKey('student', 'subject', 'session', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('first_term_total', models.DecimalField(decimal_places=2, max_digits=5, null=True)),
+                ('second_term_total', models.DecimalField(decimal_places=2, max_digits=5, null=True)),
+                ('third_term_total', models.DecimalField(decimal_places=2, max_digits=5, null=True)),
+                ('cumulative_score', models.DecimalField(decimal_places=2, max_digits=5, null=True)),
+                ('cumulative_grade', models.CharField(max_length=2, null=True)),
+            ],
+            options={
+                'verbose_name': 'Student Cumulative',
+                'verbose_name_plural': 'Student Cumulatives',
+                'db_table': 'mv_student_cumulative',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_view, drop_view),
+    ]
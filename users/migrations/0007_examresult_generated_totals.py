@@ -0,0 +1,90 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:48
+
+import django.db.models.expressions
+import django.db.models.lookups
+from importlib import import_module
+
+from django.db import migrations, models
+
+
+# mv_student_cumulative reads total_score, so PostgreSQL's
+# DROP COLUMN ... CASCADE would silently take the view with it.
+cumulative_view = import_module('users.migrations.0006_student_cumulative_view')
+
+
+def restore_stored_totals(apps, schema_editor):
+    """
+    Reverse only: the re-added plain total_score/grade/remark columns come
+    back holding their defaults, so recompute them from the score inputs.
+    """
+    from users.models import FAIL_BAND, GRADE_BANDS
+
+    ExamResult = apps.get_model('users', 'ExamResult')
+    total = models.F('ca1_score') + models.F('ca2_score') + models.F('obj_score') + models.F('theory_score')
+
+    def band_case(index, default):
+        return models.Case(
+            *[
+                models.When(django.db.models.lookups.GreaterThanOrEqual(total, band[0]), then=models.Value(band[index]))
+                for band in GRADE_BANDS
+            ],
+            default=models.Value(default),
+        )
+
+    ExamResult.objects.update(
+        total_score=total,
+        grade=band_case(1, FAIL_BAND[0]),
+        remark=band_case(2, FAIL_BAND[1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_student_cumulative_view'),
+    ]
+
+    operations = [
+        # Generated columns can't be altered in place: drop the computed
+        # columns (and the index that covers grade) and re-add them as
+        # GENERATED ALWAYS ... STORED. Existing rows are recomputed by the DB.
+        migrations.RunPython(cumulative_view.drop_view, cumulative_view.create_view),
+        # Runs after the fields below are restored when migrating backwards
+        migrations.RunPython(migrations.RunPython.noop, restore_stored_totals),
+        migrations.RemoveIndex(
+            model_name='examresult',
+            name='examresult_grade_idx',
+        ),
+        migrations.RemoveField(
+            model_name='examresult',
+            name='total_score',
+        ),
+        migrations.RemoveField(
+            model_name='examresult',
+            name='grade',
+        ),
+        migrations.RemoveField(
+            model_name='examresult',
+            name='remark',
+        ),
+        migrations.AddField(
+            model_name='examresult',
+            name='total_score',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('ca1_score'), '+', models.F('ca2_score')), '+', models.F('obj_score')), '+', models.F('theory_score')), help_text='CA1 + CA2 + OBJ + Theory (max 100)', output_field=models.DecimalField(decimal_places=2, max_digits=5)),
+        ),
+        migrations.AddField(
+            model_name='examresult',
+            name='grade',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=models.Case(models.When(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('ca1_score'), '+', models.F('ca2_score')), '+', models.F('obj_score')), '+', models.F('theory_score')), 75), then=models.Value('A')), models.When(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('ca1_score'), '+', models.F('ca2_score')), '+', models.F('obj_score')), '+', models.F('theory_score')), 70), then=models.Value('B')), models.When(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('ca1_score'), '+', models.F('ca2_score')), '+', models.F('obj_score')), '+', models.F('theory_score')), 60), then=models.Value('C')), models.When(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('ca1_score'), '+', models.F('ca2_score')), '+', models.F('obj_score')), '+', models.F('theory_score')), 50), then=models.Value('D')), models.When(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('ca1_score'), '+', models.F('ca2_score')), '+', models.F('obj_score')), '+', models.F('theory_score')), 45), then=models.Value('E')), default=models.Value('F')), help_text='Grade based on Nigerian grading scale', output_field=models.CharField(max_length=2)),
+        ),
+        migrations.AddField(
+            model_name='examresult',
+            name='remark',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('ca1_score'), '+', models.F('ca2_score')), '+', models.F('obj_score')), '+', models.F('theory_score')), 75), then=models.Value('Excellent')), models.When(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('ca1_score'), '+', models.F('ca2_score')), '+', models.F('obj_score')), '+', models.F('theory_score')), 70), then=models.Value('Very Good')), models.When(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('ca1_score'), '+', models.F('ca2_score')), '+', models.F('obj_score')), '+', models.F('theory_score')), 60), then=models.Value('Good')), models.When(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('ca1_score'), '+', models.F('ca2_score')), '+', models.F('obj_score')), '+', models.F('theory_score')), 50), then=models.Value('Pass')), models.When(django.db.models.lookups.GreaterThanOrEqual(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('ca1_score'), '+', models.F('ca2_score')), '+', models.F('obj_score')), '+', models.F('theory_score')), 45), then=models.Value('Fair')), default=models.Value('Fail')), help_text='Grade remark (Excellent, Very Good, Good, Pass, Fair, Fail)', output_field=models.CharField(max_length=20)),
+        ),
+        migrations.AddIndex(
+            model_name='examresult',
+            index=models.Index(fields=['session', 'term', 'grade'], name='examresult_grade_idx'),
+        ),
+        migrations.RunPython(cumulative_view.create_view, cumulative_view.drop_view),
+    ]
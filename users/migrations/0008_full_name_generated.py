@@ -0,0 +1,50 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:55
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+CREATE_TRGM_INDEXES_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS userprofile_fullname_trgm
+    ON users_userprofile USING gin (full_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS student_fullname_trgm
+    ON users_activestudent USING gin (full_name gin_trgm_ops);
+"""
+
+DROP_TRGM_INDEXES_SQL = """
+DROP INDEX IF EXISTS userprofile_fullname_trgm;
+DROP INDEX IF EXISTS student_fullname_trgm;
+"""
+
+
+def create_trgm_indexes(apps, schema_editor):
+    # Trigram GIN indexes back icontains/ILIKE searches; PostgreSQL only
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_TRGM_INDEXES_SQL)
+
+
+def drop_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_TRGM_INDEXES_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_examresult_generated_totals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activestudent',
+            name='full_name',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(models.Q(('middle_name__isnull', True), ('middle_name', ''), _connector='OR'), then=django.db.models.functions.text.Concat('first_name', models.Value(' '), 'last_name')), default=django.db.models.functions.text.Concat('first_name', models.Value(' '), 'middle_name', models.Value(' '), 'last_name')), output_field=models.CharField(max_length=302)),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='full_name',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Trim(django.db.models.functions.text.Concat('first_name', models.Value(' '), 'last_name')), output_field=models.CharField(max_length=301)),
+        ),
+        migrations.RunPython(create_trgm_indexes, drop_trgm_indexes),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:56
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_full_name_generated'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='cascore',
+            options={'verbose_name': 'CA Score (CA1 + CA2)', 'verbose_name_plural': 'CA Scores'},
+        ),
+        migrations.AlterModelOptions(
+            name='examresult',
+            options={'verbose_name': 'Exam Result', 'verbose_name_plural': 'Exam Results'},
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:57
+
+import django.db.models.lookups
+from importlib import import_module
+
+from django.db import migrations, models
+
+from users.utils import student_cumulative_view_sql
+
+
+cumulative_view = import_module('users.migrations.0006_student_cumulative_view')
+
+
+def key_view_on_ordinal(apps, schema_editor):
+    # Re-key mv_student_cumulative's term columns on the new ordinal
+    cumulative_view.drop_view(apps, schema_editor)
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(student_cumulative_view_sql())
+
+
+def key_view_on_name(apps, schema_editor):
+    cumulative_view.drop_view(apps, schema_editor)
+    cumulative_view.create_view(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_remove_score_default_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='term',
+            name='ordinal',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(django.db.models.lookups.Exact(models.F('name'), 'First Term'), then=models.Value(1)), models.When(django.db.models.lookups.Exact(models.F('name'), 'Second Term'), then=models.Value(2)), models.When(django.db.models.lookups.Exact(models.F('name'), 'Third Term'), then=models.Value(3)), default=models.Value(0)), output_field=models.PositiveSmallIntegerField()),
+        ),
+        migrations.RunPython(key_view_on_ordinal, key_view_on_name),
+    ]
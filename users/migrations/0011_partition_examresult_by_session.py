@@ -0,0 +1,137 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:10
+
+from importlib import import_module
+
+from django.db import migrations
+
+from users.utils import student_cumulative_view_sql
+
+
+cumulative_view = import_module('users.migrations.0006_student_cumulative_view')
+
+TABLE = 'users_examresult'
+
+# Unique and foreign key constraints of the table, as reusable definitions
+CONSTRAINTS_SQL = """
+SELECT conname, pg_get_constraintdef(oid)
+FROM pg_constraint
+WHERE conrelid = %s::regclass AND contype IN ('u', 'f')
+ORDER BY contype DESC, conname
+"""
+
+# Indexes that do not back a constraint, as CREATE INDEX statements
+INDEXES_SQL = """
+SELECT pg_get_indexdef(i.indexrelid)
+FROM pg_index i
+WHERE i.indrelid = %s::regclass
+  AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+"""
+
+
+def _rebuild_exam_result_table(schema_editor, partition_by, primary_key, session_ids=()):
+    """
+    Copy users_examresult into a freshly created table and swap it in.
+
+    The new table is created with LIKE (columns, defaults, generated columns,
+    identity, CHECK constraints); the unique/foreign keys and indexes are
+    read from the catalog first and recreated under their original names, so
+    later migrations still find them.
+    """
+    qn = schema_editor.quote_name
+    old_table = f'{TABLE}_old'
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(CONSTRAINTS_SQL, [TABLE])
+        constraints = cursor.fetchall()
+        cursor.execute(INDEXES_SQL, [TABLE])
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            'SELECT attname FROM pg_attribute '
+            'WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped '
+            "AND attgenerated = '' ORDER BY attnum",
+            [TABLE],
+        )
+        columns = ', '.join(qn(row[0]) for row in cursor.fetchall())
+
+    # The view selects from the table; it is recreated once the swap is done
+    schema_editor.execute(cumulative_view.DROP_VIEW_SQL)
+
+    schema_editor.execute(f'ALTER TABLE {qn(TABLE)} RENAME TO {qn(old_table)}')
+    schema_editor.execute(
+        f'CREATE TABLE {qn(TABLE)} (LIKE {qn(old_table)} '
+        f'INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING IDENTITY INCLUDING CONSTRAINTS)'
+        + (f' PARTITION BY {partition_by}' if partition_by else '')
+    )
+    for session_id in session_ids:
+        schema_editor.execute(
+            f'CREATE TABLE {qn(f"{TABLE}_s{int(session_id)}")} '
+            f'PARTITION OF {qn(TABLE)} FOR VALUES IN ({int(session_id)})'
+        )
+    if partition_by:
+        schema_editor.execute(f'CREATE TABLE {qn(f"{TABLE}_default")} PARTITION OF {qn(TABLE)} DEFAULT')
+
+    schema_editor.execute(f'INSERT INTO {qn(TABLE)} ({columns}) SELECT {columns} FROM {qn(old_table)}')
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+        f"COALESCE((SELECT MAX(id) FROM {qn(TABLE)}), 0) + 1, false)"
+    )
+    # Frees the constraint, index and sequence names for the new table
+    schema_editor.execute(f'DROP TABLE {qn(old_table)}')
+    # LIKE ... INCLUDING IDENTITY had to pick a fresh sequence name
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [TABLE, 'id'])
+        sequence = cursor.fetchone()[0]
+    schema_editor.execute(f'ALTER SEQUENCE {sequence} RENAME TO {qn(f"{TABLE}_id_seq")}')
+
+    schema_editor.execute(
+        f'ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(f"{TABLE}_pkey")} '
+        f'PRIMARY KEY ({", ".join(qn(column) for column in primary_key)})'
+    )
+    for name, definition in constraints:
+        schema_editor.execute(f'ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(name)} {definition}')
+    for sql in indexes:
+        schema_editor.execute(sql)
+
+    schema_editor.execute(student_cumulative_view_sql())
+
+
+def partition_exam_results(apps, schema_editor):
+    """
+    Rebuild users_examresult as a table LIST-partitioned on session_id.
+
+    One partition per AcademicSession (new sessions get theirs from
+    utils.create_exam_result_partition) plus a DEFAULT partition so an
+    insert can never fail for lack of one. Primary and unique keys on a
+    partitioned table must contain the partition key, so the primary key
+    becomes (id, session_id); unique_together already includes session_id.
+    PostgreSQL only.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    AcademicSession = apps.get_model('users', 'AcademicSession')
+    _rebuild_exam_result_table(
+        schema_editor,
+        partition_by='LIST (session_id)',
+        primary_key=('id', 'session_id'),
+        session_ids=AcademicSession.objects.values_list('id', flat=True),
+    )
+
+
+def unpartition_exam_results(apps, schema_editor):
+    """Copy the rows back into a plain users_examresult keyed on id."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    _rebuild_exam_result_table(schema_editor, partition_by=None, primary_key=('id',))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_term_ordinal'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_exam_results, unpartition_exam_results),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-17 05:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_partition_examresult_by_session'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='academicsession',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_current', True)), fields=('is_current',), name='unique_current_session'),
+        ),
+        migrations.AddConstraint(
+            model_name='term',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_current', True)), fields=('session',), name='unique_current_term_per_session'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.3 on 2026-10-17 05:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0012_current_session_term_constraints'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='academicsession',
+            name='name',
+            field=models.CharField(max_length=20, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='activestudent',
+            name='admission_number',
+            field=models.CharField(max_length=50, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='activestudent',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='classlevel',
+            name='name',
+            field=models.CharField(choices=[('JSS1', 'Junior Secondary 1'), ('JSS2', 'Junior Secondary 2'), ('JSS3', 'Junior Secondary 3'), ('SS1', 'Senior Secondary 1'), ('SS2', 'Senior Secondary 2'), ('SS3', 'Senior Secondary 3')], max_length=10, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='classlevel',
+            name='order',
+            field=models.IntegerField(unique=True),
+        ),
+        migrations.AlterField(
+            model_name='subject',
+            name='code',
+            field=models.CharField(max_length=20, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='subject',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='email',
+            field=models.EmailField(max_length=254, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='role',
+            field=models.CharField(choices=[('admin', 'Admin'), ('superadmin', 'Superadmin')], default='admin', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='username',
+            field=models.CharField(max_length=150, unique=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-17 06:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0013_drop_redundant_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionCounter',
+            fields=[
+                ('year', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('last_number', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Admission Counter',
+                'verbose_name_plural': 'Admission Counters',
+            },
+        ),
+    ]
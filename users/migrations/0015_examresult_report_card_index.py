@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-17 06:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0014_admissioncounter'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='examresult',
+            name='examresult_student_session_idx',
+        ),
+        migrations.AddIndex(
+            model_name='examresult',
+            index=models.Index(fields=['student', 'session', 'term'], include=('subject', 'total_score', 'grade'), name='examresult_report_card_idx'),
+        ),
+    ]
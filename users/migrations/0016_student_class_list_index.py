@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-17 07:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0015_examresult_report_card_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='activestudent',
+            name='student_class_active_idx',
+        ),
+        migrations.AlterField(
+            model_name='activestudent',
+            name='class_level',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='students', to='users.classlevel'),
+        ),
+        migrations.AddIndex(
+            model_name='activestudent',
+            index=models.Index(fields=['class_level', 'is_active', 'admission_number'], name='student_class_active_adm_idx'),
+        ),
+    ]
@@ -7,25 +7,73 @@ Updated with Nigerian Secondary School Grading Structure:
 - Theory: 40 marks (manual)
 - Total: 100 marks
 """
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from fractions import Fraction
+from django.conf import settings
 from django.contrib.auth.hashers import make_password
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Case, F, Prefetch, Q, Value, When
+from django.db.models.functions import Concat, Trim
+from django.db.models.lookups import Exact, GreaterThanOrEqual
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from cloudinary.models import CloudinaryField
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils.functional import cached_property
+
+# utils only imports models inside its functions, so this is cycle-free
+from .utils import generate_admission_number, generate_admission_numbers, generate_password
+
+
+class GeneratedFieldsMixin:
+    """
+    Keep a model's GeneratedField values current on the instance after save().
+    
+    Django reads generated columns back after an INSERT but not after an
+    UPDATE, so without this a saved instance keeps stale values (e.g.
+    full_name after a rename). Models return the same values computed in
+    Python from generated_values(); saves whose update_fields touch none of
+    the generated columns' inputs skip it.
+    """
+    
+    def generated_values(self):
+        """{field name: value} for every GeneratedField, computed locally"""
+        raise NotImplementedError
+    
+    @classmethod
+    def _generated_inputs(cls):
+        if '_generated_input_names' not in cls.__dict__:
+            cls._generated_input_names = frozenset(
+                expression.name
+                for field in cls._meta.concrete_fields if field.generated
+                for expression in field.expression.flatten() if isinstance(expression, F)
+            )
+        return cls._generated_input_names
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        super().save(*args, **kwargs)
+        if update_fields is None or not self._generated_inputs().isdisjoint(update_fields):
+            for name, value in self.generated_values().items():
+                setattr(self, name, value)
 
 
 # ==============================================================================
 # USER PROFILE (ADMIN/SUPERADMIN)
 # ==============================================================================
 
+# Roles allowed into the admin API (every UserProfile.role choice)
+ADMIN_ROLES = frozenset({'admin', 'superadmin'})
+
+
 class UserProfileManager(BaseUserManager):
     """Custom manager for UserProfile model"""
     
     def create_user(self, username, email, first_name, last_name, role='admin', phone_number=None, password=None):
         if not username:
             raise ValueError('Username is required')
-        if role not in ['admin', 'superadmin']:
+        if role not in ADMIN_ROLES:
             raise ValueError('Role must be admin or superadmin')
         
         email = self.normalize_email(email)
@@ -57,7 +105,7 @@ class UserProfileManager(BaseUserManager):
         return user
 
 
-class UserProfile(AbstractBaseUser, PermissionsMixin):
+class UserProfile(GeneratedFieldsMixin, AbstractBaseUser, PermissionsMixin):
     """Admin/SuperAdmin user model"""
     
     ROLE_CHOICES = (
@@ -69,16 +117,22 @@ class UserProfile(AbstractBaseUser, PermissionsMixin):
         ('female', 'Female'),
     )
     
-    username = models.CharField(max_length=150, unique=True, db_index=True)
-    email = models.EmailField(unique=True, db_index=True)
+    username = models.CharField(max_length=150, unique=True)
+    email = models.EmailField(unique=True)
     first_name = models.CharField(max_length=150)
     last_name = models.CharField(max_length=150)
+    # Generated by the database so name searches hit one (trigram-indexed) column
+    full_name = models.GeneratedField(
+        expression=Trim(Concat('first_name', Value(' '), 'last_name')),
+        output_field=models.CharField(max_length=301),
+        db_persist=True,
+    )
     age = models.PositiveIntegerField(null=True, blank=True)
     sex = models.CharField(max_length=10, choices=SEX_CHOICES, null=True, blank=True)
     address = models.TextField(blank=True, null=True)
     state_of_origin = models.CharField(max_length=100, blank=True, null=True)
     local_govt_area = models.CharField(max_length=100, blank=True, null=True)
-    role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='admin', db_index=True)
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='admin')
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     is_active = models.BooleanField(default=True, db_index=True)
     is_staff = models.BooleanField(default=False)
@@ -101,9 +155,8 @@ class UserProfile(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return f"{self.full_name} ({self.role})"
     
-    @property
-    def full_name(self):
-        return f"{self.first_name} {self.last_name}".strip()
+    def generated_values(self):
+        return {'full_name': f"{self.first_name} {self.last_name}".strip()}
 
 
 # ==============================================================================
@@ -185,21 +238,41 @@ class Student(models.Model):
 # CBT INTEGRATION MODELS - MOLEK SCHOOL
 # ==============================================================================
 
+class AcademicSessionQuerySet(models.QuerySet):
+    """QuerySet for AcademicSession"""
+
+    def with_terms(self):
+        """Prefetch terms in one query, in term order within each session"""
+        # Term's default ordering starts with 'session', which joins the
+        # session table just to sort by its start_date; the prefetch groups
+        # terms by session anyway
+        return self.prefetch_related(
+            Prefetch('terms', queryset=Term.objects.order_by('name'))
+        )
+
+
 class AcademicSession(models.Model):
     """Academic year (e.g., 2024/2025)"""
     
-    name = models.CharField(max_length=20, unique=True, db_index=True)
+    name = models.CharField(max_length=20, unique=True)
     start_date = models.DateField(db_index=True)
     end_date = models.DateField()
     is_current = models.BooleanField(default=False, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = AcademicSessionQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-start_date']
         indexes = [
             models.Index(fields=['is_current', 'start_date'], name='session_current_start_idx'),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['is_current'], condition=Q(is_current=True), name='unique_current_session'
+            ),
+        ]
         verbose_name = "Academic Session"
         verbose_name_plural = "Academic Sessions"
     
@@ -208,11 +281,21 @@ class AcademicSession(models.Model):
     
     def save(self, *args, **kwargs):
         if self.is_current:
-            AcademicSession.objects.filter(is_current=True).update(is_current=False)
-        super().save(*args, **kwargs)
+            # Demote the previous current session (at most one row, found
+            # through the partial unique index) in the same transaction
+            with transaction.atomic():
+                AcademicSession.objects.filter(is_current=True).exclude(pk=self.pk).update(is_current=False)
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+    
+    def validate_constraints(self, exclude=None):
+        # save() demotes the previous current session, so setting is_current
+        # is never a validation error (admin/ModelForm full_clean)
+        super().validate_constraints(exclude={*(exclude or ()), 'is_current'})
 
 
-class Term(models.Model):
+class Term(GeneratedFieldsMixin, models.Model):
     """School terms within an academic session"""
     
     TERM_CHOICES = [
@@ -220,6 +303,11 @@ class Term(models.Model):
         ('Second Term', 'Second Term'),
         ('Third Term', 'Third Term'),
     ]
+    TERM_ORDINALS = {
+        'First Term': 1,
+        'Second Term': 2,
+        'Third Term': 3,
+    }
     
     session = models.ForeignKey(
         AcademicSession, 
@@ -228,6 +316,17 @@ class Term(models.Model):
         db_index=True
     )
     name = models.CharField(max_length=20, choices=TERM_CHOICES, db_index=True)
+    # 1/2/3 derived from name by the database (0 for unknown names). The
+    # conditions are lookups rather than Q objects so model validation can
+    # substitute field values into the expression (validate_constraints).
+    ordinal = models.GeneratedField(
+        expression=Case(
+            *[When(Exact(F('name'), term_name), then=Value(number)) for term_name, number in TERM_ORDINALS.items()],
+            default=Value(0),
+        ),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
     start_date = models.DateField()
     end_date = models.DateField()
     is_current = models.BooleanField(default=False, db_index=True)
@@ -239,6 +338,11 @@ class Term(models.Model):
         indexes = [
             models.Index(fields=['session', 'is_current'], name='term_session_current_idx'),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['session'], condition=Q(is_current=True), name='unique_current_term_per_session'
+            ),
+        ]
         verbose_name = "Term"
         verbose_name_plural = "Terms"
     
@@ -247,18 +351,25 @@ class Term(models.Model):
     
     def save(self, *args, **kwargs):
         if self.is_current:
-            Term.objects.filter(session=self.session, is_current=True).update(is_current=False)
-        super().save(*args, **kwargs)
+            with transaction.atomic():
+                Term.objects.filter(
+                    session_id=self.session_id, is_current=True
+                ).exclude(pk=self.pk).update(is_current=False)
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+    
+    def generated_values(self):
+        return {'ordinal': self.term_number}
+    
+    def validate_constraints(self, exclude=None):
+        # save() demotes the session's previous current term
+        super().validate_constraints(exclude={*(exclude or ()), 'is_current'})
     
     @property
     def term_number(self):
         """Return term number (1, 2, or 3)"""
-        term_map = {
-            'First Term': 1,
-            'Second Term': 2,
-            'Third Term': 3
-        }
-        return term_map.get(self.name, 0)
+        return self.TERM_ORDINALS.get(self.name, 0)
 
 
 class ClassLevel(models.Model):
@@ -273,8 +384,8 @@ class ClassLevel(models.Model):
         ('SS3', 'Senior Secondary 3'),
     ]
     
-    name = models.CharField(max_length=10, choices=CLASS_CHOICES, unique=True, db_index=True)
-    order = models.IntegerField(unique=True, db_index=True)
+    name = models.CharField(max_length=10, choices=CLASS_CHOICES, unique=True)
+    order = models.IntegerField(unique=True)
     description = models.CharField(max_length=100, blank=True)
     
     class Meta:
@@ -286,16 +397,28 @@ class ClassLevel(models.Model):
         return self.name
 
 
+class SubjectQuerySet(models.QuerySet):
+    """QuerySet for Subject"""
+
+    def with_levels(self):
+        """Prefetch class levels in one query (select_related can't follow M2M)"""
+        return self.prefetch_related(
+            Prefetch('class_levels', queryset=ClassLevel.objects.only('id', 'name'))
+        )
+
+
 class Subject(models.Model):
     """School subjects"""
     
     name = models.CharField(max_length=100, db_index=True)
-    code = models.CharField(max_length=20, unique=True, db_index=True)
+    code = models.CharField(max_length=20, unique=True)
     description = models.TextField(blank=True)
     class_levels = models.ManyToManyField(ClassLevel, related_name='subjects', blank=True)
-    is_active = models.BooleanField(default=True, db_index=True)
+    is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = SubjectQuerySet.as_manager()
+    
     class Meta:
         ordering = ['name']
         indexes = [
@@ -308,7 +431,55 @@ class Subject(models.Model):
         return f"{self.name} ({self.code})"
 
 
-class ActiveStudent(models.Model):
+class ActiveStudentQuerySet(models.QuerySet):
+    """QuerySet for ActiveStudent"""
+
+    def for_list(self):
+        """Join the relations shown by student lists, exports and the admin changelist"""
+        return self.select_related('class_level', 'enrollment_session', 'created_by')
+    
+    def without_credentials(self):
+        """Skip the password columns for reads that never show them"""
+        return self.defer('password_plain', 'password_hash')
+    
+    def bulk_enroll(self, students):
+        """
+        Create unsaved ActiveStudent instances in bulk.
+        
+        Admission numbers and passwords are assigned as in save(); the
+        password hashes are computed in a thread pool (the Argon2/PBKDF2
+        hashers run in C without the GIL) before a batched bulk_create.
+        The number block is reserved in the insert's transaction, so a
+        failed insert hands it back and the counter is only locked for
+        the insert itself.
+        """
+        students = list(students)
+        new = [student for student in students if not student.admission_number]
+        for student in new:
+            if not student.password_plain:
+                student.password_plain = generate_password()
+        
+        # Sized by PASSWORD_HASH_WORKERS (each running hash holds its memory)
+        with ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix='password-hash'
+        ) as pool:
+            hashes = pool.map(make_password, [student.password_plain for student in new])
+            for student, password_hash in zip(new, hashes):
+                student.password_hash = password_hash
+        
+        with transaction.atomic():
+            for student, admission_number in zip(new, generate_admission_numbers(len(new))):
+                student.admission_number = admission_number
+            return self.bulk_create(students, batch_size=settings.BULK_BATCH_SIZE)
+
+    def with_subjects(self):
+        """Prefetch subjects in one query (select_related can't follow M2M)"""
+        return self.prefetch_related(
+            Prefetch('subjects', queryset=Subject.objects.only('id', 'code', 'name'))
+        )
+
+
+class ActiveStudent(GeneratedFieldsMixin, models.Model):
     """
     Active Student Model for CBT Integration
     
@@ -321,10 +492,23 @@ class ActiveStudent(models.Model):
     ]
     
     # Basic Information
-    admission_number = models.CharField(max_length=50, unique=True, db_index=True)
+    admission_number = models.CharField(max_length=50, unique=True)
     first_name = models.CharField(max_length=100)
     middle_name = models.CharField(max_length=100, blank=True, null=True)
     last_name = models.CharField(max_length=100)
+    # "First Middle Last" (middle name skipped when empty), generated by the
+    # database so name searches hit one (trigram-indexed) column
+    full_name = models.GeneratedField(
+        expression=Case(
+            When(
+                Q(middle_name__isnull=True) | Q(middle_name=''),
+                then=Concat('first_name', Value(' '), 'last_name'),
+            ),
+            default=Concat('first_name', Value(' '), 'middle_name', Value(' '), 'last_name'),
+        ),
+        output_field=models.CharField(max_length=302),
+        db_persist=True,
+    )
     
     # Authentication
     password_plain = models.CharField(max_length=20, blank=True)
@@ -347,7 +531,8 @@ class ActiveStudent(models.Model):
         on_delete=models.SET_NULL, 
         null=True, 
         related_name='students',
-        db_index=True
+        # Covered by the leading column of student_class_active_adm_idx
+        db_index=False
     )
     subjects = models.ManyToManyField(Subject, related_name='students', blank=True)
     enrollment_session = models.ForeignKey(
@@ -366,7 +551,7 @@ class ActiveStudent(models.Model):
     passport = CloudinaryField('image', blank=True, null=True)
     
     # Status
-    is_active = models.BooleanField(default=True, db_index=True)
+    is_active = models.BooleanField(default=True)
     graduation_date = models.DateField(null=True, blank=True)
     
     # Metadata
@@ -379,10 +564,14 @@ class ActiveStudent(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ActiveStudentQuerySet.as_manager()
+    
     class Meta:
         ordering = ['admission_number']
         indexes = [
-            models.Index(fields=['class_level', 'is_active'], name='student_class_active_idx'),
+            # Class lists filter on class/status and sort by admission number
+            # (the default ordering), so a page is read straight off the index
+            models.Index(fields=['class_level', 'is_active', 'admission_number'], name='student_class_active_adm_idx'),
             models.Index(fields=['is_active', 'created_at'], name='student_active_created_idx'),
             models.Index(fields=['first_name', 'last_name'], name='student_name_idx'),
         ]
@@ -392,26 +581,79 @@ class ActiveStudent(models.Model):
     def __str__(self):
         return f"{self.full_name} ({self.admission_number})"
     
-    @property
-    def full_name(self):
-        parts = [self.first_name]
-        if self.middle_name:
-            parts.append(self.middle_name)
-        parts.append(self.last_name)
-        return ' '.join(parts)
-    
     def save(self, *args, **kwargs):
         if not self.admission_number:
-            from .utils import generate_admission_number, generate_password
-            
             self.admission_number = generate_admission_number()
             
             if not self.password_plain:
                 self.password_plain = generate_password()
             
+            # One Argon2 hash (~0.3 s, CPU and memory bound) per manual enrolment;
+            # bulk uploads hash in parallel via bulk_enroll()
             self.password_hash = make_password(self.password_plain)
         
         super().save(*args, **kwargs)
+    
+    def generated_values(self):
+        middle = f"{self.middle_name} " if self.middle_name else ""
+        return {'full_name': f"{self.first_name} {middle}{self.last_name}"}
+
+
+class AdmissionCounter(models.Model):
+    """
+    Last admission number issued per year (the XXX in MOL/YYYY/XXX).
+    
+    reserve() bumps the row with a single UPDATE ... RETURNING, so concurrent
+    enrolments never draw the same number and no query scans the students
+    table.
+    """
+    
+    year = models.PositiveIntegerField(primary_key=True)
+    last_number = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = "Admission Counter"
+        verbose_name_plural = "Admission Counters"
+    
+    def __str__(self):
+        return f"{self.year}: {self.last_number}"
+    
+    @classmethod
+    def reserve(cls, year, count=1):
+        """Reserve count consecutive numbers for year and return the first"""
+        last_number = cls._bump(year, count)
+        if last_number is None:
+            # First admission of the year; a concurrent creator may win the
+            # insert, which is fine as long as the row exists
+            cls.objects.bulk_create(
+                [cls(year=year, last_number=cls._issued_before(year))], ignore_conflicts=True
+            )
+            last_number = cls._bump(year, count)
+        return last_number - count + 1
+    
+    @classmethod
+    def _bump(cls, year, count):
+        """
+        Add count to year's counter and return the new value (None if the
+        row doesn't exist) - a single UPDATE ... RETURNING round trip.
+        """
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} SET last_number = last_number + %s '
+                f'WHERE year = %s RETURNING last_number',
+                [count, year],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+    
+    @staticmethod
+    def _issued_before(year):
+        """Highest number already issued for year (seeds a new counter row)"""
+        numbers = ActiveStudent.objects.filter(
+            admission_number__startswith=f'MOL/{year}/'
+        ).values_list('admission_number', flat=True)
+        return max((int(number.rsplit('/', 1)[-1]) for number in numbers), default=0)
 
 
 # ==============================================================================
@@ -420,6 +662,27 @@ class ActiveStudent(models.Model):
 # Admin configures max marks for each component
 # ==============================================================================
 
+class ScoreQuerySet(models.QuerySet):
+    """QuerySet shared by CAScore and ExamResult"""
+
+    def for_display(self):
+        """Join the relations used by __str__, admin list_display and list serializers"""
+        return self.select_related('student', 'student__class_level', 'subject', 'session', 'term')
+
+    def bulk_ingest(self, objs, update_fields):
+        """
+        Insert objs in batches, updating update_fields on rows that already
+        exist for the same student/subject/session/term (upsert).
+        """
+        return self.bulk_create(
+            objs,
+            batch_size=settings.BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['student', 'subject', 'session', 'term'],
+            update_fields=update_fields,
+        )
+
+
 class CAScore(models.Model):
     """
     Continuous Assessment Score Model (CA1 + CA2)
@@ -482,6 +745,8 @@ class CAScore(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ScoreQuerySet.as_manager()
+    
     class Meta:
         unique_together = ('student', 'subject', 'session', 'term')
         indexes = [
@@ -490,7 +755,6 @@ class CAScore(models.Model):
         ]
         verbose_name = 'CA Score (CA1 + CA2)'
         verbose_name_plural = 'CA Scores'
-        ordering = ['-created_at']
     
     def __str__(self):
         return f"{self.student.admission_number} - {self.subject.name}: CA1={self.ca1_score}, CA2={self.ca2_score}"
@@ -501,7 +765,55 @@ class CAScore(models.Model):
         return (self.ca1_score or 0) + (self.ca2_score or 0)
 
 
-class ExamResult(models.Model):
+# Nigerian grading scale: (minimum score, grade, remark), highest band first
+GRADE_BANDS = (
+    (75, 'A', 'Excellent'),
+    (70, 'B', 'Very Good'),
+    (60, 'C', 'Good'),
+    (50, 'D', 'Pass'),
+    (45, 'E', 'Fair'),
+)
+FAIL_BAND = ('F', 'Fail')
+
+# Ascending band minimums and the (grade, remark) each one starts, so a
+# score maps to its band with one bisect instead of a comparison chain
+GRADE_THRESHOLDS = tuple(minimum for minimum, _, _ in reversed(GRADE_BANDS))
+GRADE_LOOKUP = (FAIL_BAND,) + tuple((grade, remark) for _, grade, remark in reversed(GRADE_BANDS))
+
+# Term.ordinal -> ExamResult field holding that term's total
+TERM_TOTAL_FIELDS = (None, 'first_term_total', 'second_term_total', 'third_term_total')
+
+# ExamResult fields that feed total_score and the cumulative calculation
+SCORE_INPUT_FIELDS = frozenset({
+    'ca1_score', 'ca2_score', 'obj_score', 'theory_score',
+    'student', 'subject', 'session', 'term',
+})
+SCORE_INPUT_ATTNAMES = (
+    'ca1_score', 'ca2_score', 'obj_score', 'theory_score',
+    'student_id', 'subject_id', 'session_id', 'term_id',
+)
+# ExamResult fields written by _calculate_cumulative()
+CUMULATIVE_RESULT_FIELDS = [
+    'first_term_total', 'second_term_total', 'third_term_total',
+    'cumulative_score', 'cumulative_grade',
+]
+
+EXAM_TOTAL_EXPRESSION = F('ca1_score') + F('ca2_score') + F('obj_score') + F('theory_score')
+
+
+def _grade_case(score_expression, part):
+    """SQL CASE mirroring ExamResult.calculate_grade() for GeneratedFields"""
+    index = 1 if part == 'grade' else 2
+    return Case(
+        *[
+            When(GreaterThanOrEqual(score_expression, band[0]), then=Value(band[index]))
+            for band in GRADE_BANDS
+        ],
+        default=Value(FAIL_BAND[index - 1]),
+    )
+
+
+class ExamResult(GeneratedFieldsMixin, models.Model):
     """
     Final Exam Result Model
     
@@ -601,27 +913,32 @@ class ExamResult(models.Model):
     # CALCULATED FIELDS
     # =====================
     
+    # Computed by the database (GENERATED ALWAYS ... STORED) so the values
+    # stay correct for bulk_create/bulk_update and raw SQL writes too.
+    
     # Total Score (CA1 + CA2 + OBJ + Theory = 100)
-    total_score = models.DecimalField(
-        max_digits=5,
-        decimal_places=2,
-        help_text="CA1 + CA2 + OBJ + Theory (max 100)",
-        default=0
+    total_score = models.GeneratedField(
+        expression=EXAM_TOTAL_EXPRESSION,
+        output_field=models.DecimalField(max_digits=5, decimal_places=2),
+        db_persist=True,
+        help_text="CA1 + CA2 + OBJ + Theory (max 100)"
     )
     
     # Grade (A, B, C, D, E, F)
-    grade = models.CharField(
-        max_length=2,
-        help_text="Grade based on Nigerian grading scale",
+    grade = models.GeneratedField(
+        expression=_grade_case(EXAM_TOTAL_EXPRESSION, 'grade'),
+        output_field=models.CharField(max_length=2),
+        db_persist=True,
         db_index=True,
-        default='F'
+        help_text="Grade based on Nigerian grading scale"
     )
     
     # Grade Remark
-    remark = models.CharField(
-        max_length=20,
-        help_text="Grade remark (Excellent, Very Good, Good, Pass, Fair, Fail)",
-        default='Fail'
+    remark = models.GeneratedField(
+        expression=_grade_case(EXAM_TOTAL_EXPRESSION, 'remark'),
+        output_field=models.CharField(max_length=20),
+        db_persist=True,
+        help_text="Grade remark (Excellent, Very Good, Good, Pass, Fair, Fail)"
     )
     
     # =====================
@@ -689,40 +1006,90 @@ class ExamResult(models.Model):
         null=True
     )
     
+    objects = ScoreQuerySet.as_manager()
+    
     class Meta:
         unique_together = ('student', 'subject', 'session', 'term')
         indexes = [
             models.Index(fields=['session', 'term'], name='examresult_session_term_idx'),
-            models.Index(fields=['student', 'session'], name='examresult_student_session_idx'),
             models.Index(fields=['session', 'term', 'grade'], name='examresult_grade_idx'),
+            # Student report cards: also serves (student, session) lookups, and
+            # totals/grades per subject come straight from the index (PostgreSQL)
+            models.Index(
+                fields=['student', 'session', 'term'],
+                include=['subject', 'total_score', 'grade'],
+                name='examresult_report_card_idx',
+            ),
         ]
         verbose_name = 'Exam Result'
         verbose_name_plural = 'Exam Results'
-        ordering = ['-uploaded_at']
     
     def __str__(self):
         return f"{self.student.admission_number} - {self.subject.name}: {self.total_score} ({self.grade})"
     
+    # Score inputs as loaded from the database (see from_db)
+    _initial_scores = None
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if all(attname in field_names for attname in SCORE_INPUT_ATTNAMES):
+            instance._initial_scores = instance._score_inputs()
+        return instance
+    
+    def _score_inputs(self):
+        return tuple(getattr(self, attname) for attname in SCORE_INPUT_ATTNAMES)
+    
     def save(self, *args, **kwargs):
-        # Auto-calculate total score
-        self.total_score = (
-            (self.ca1_score or 0) +
-            (self.ca2_score or 0) +
-            (self.obj_score or 0) +
-            (self.theory_score or 0)
-        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            if not SCORE_INPUT_FIELDS.intersection(update_fields):
+                # Nothing that feeds the totals changed - trust the caller
+                super().save(*args, **kwargs)
+                return
+            # Recalculated cumulative values must be written too
+            kwargs['update_fields'] = set(update_fields).union(CUMULATIVE_RESULT_FIELDS)
+        elif self._initial_scores is not None and self._score_inputs() == self._initial_scores:
+            # Non-score edit of a loaded row - skip the cumulative peer query
+            super().save(*args, **kwargs)
+            return
         
-        # Auto-calculate grade and remark
-        self.grade, self.remark = self.calculate_grade(self.total_score)
+        # The cumulative fields need this row's new total and grade before
+        # the database has generated them
+        generated = self.generated_values()
         
-        # Calculate cumulative score if we have term data
-        self._calculate_cumulative()
+        # One transaction, so a failing peer write cannot leave the
+        # session's cumulative columns half-updated
+        with transaction.atomic():
+            self._calculate_cumulative(
+                generated['total_score'], (generated['grade'], generated['remark'])
+            )
+            super().save(*args, **kwargs)
+            
+            # The other terms' rows carry this term's total and the average
+            for peer in ExamResult.objects.filter(
+                student_id=self.student_id,
+                subject_id=self.subject_id,
+                session_id=self.session_id,
+            ).exclude(pk=self.pk).select_related('term'):
+                peer._save_cumulative_only()
         
-        super().save(*args, **kwargs)
+        self._initial_scores = self._score_inputs()
     
+    def generated_values(self):
+        total = self.total_ca + self.exam_total
+        grade, remark = self.calculate_grade(total)
+        return {'total_score': total, 'grade': grade, 'remark': remark}
     
-
-    def _calculate_cumulative(self):
+    def _save_cumulative_only(self):
+        """
+        Recalculate and write only the cumulative columns - used when a
+        peer term's result changed but this row's scores did not.
+        """
+        self._calculate_cumulative(self.total_score, (self.grade, self.remark))
+        self.save(update_fields=CUMULATIVE_RESULT_FIELDS)
+    
+    def _calculate_cumulative(self, total_score=None, precomputed_grade=None):
         """
         Calculate cumulative score based on all term totals within the same session.
         
@@ -733,17 +1100,20 @@ class ExamResult(models.Model):
         
         This method queries the database for prior term results
         to ensure accuracy even when saving a new term's result.
+        
+        total_score / precomputed_grade: this result's total and its
+        (grade, remark), when the caller already has them.
         """
-        term_name = self.term.name if self.term else ''
-        current_total = float(self.total_score)
+        # self.term is cached once loaded; callers batching results select_related it
+        term_ordinal = self.term.ordinal if self.term_id else 0
+        if total_score is None:
+            total_score = self.total_ca + self.exam_total
+        current_total = float(total_score)
 
         # Always reset term total fields based on current term
-        if term_name == 'First Term':
-            self.first_term_total = self.total_score
-        elif term_name == 'Second Term':
-            self.second_term_total = self.total_score
-        elif term_name == 'Third Term':
-            self.third_term_total = self.total_score
+        field = TERM_TOTAL_FIELDS[term_ordinal]
+        if field:
+            setattr(self, field, total_score)
 
         # Query database for other terms' results in the same session
         # for the same student and subject
@@ -752,17 +1122,14 @@ class ExamResult(models.Model):
                 student_id=self.student_id,
                 subject_id=self.subject_id,
                 session_id=self.session_id,
-            ).exclude(
-                pk=self.pk  # Exclude current record (may not exist yet if creating)
-            ).select_related('term')
-
-            for result in other_results:
-                if result.term.name == 'First Term':
-                    self.first_term_total = result.total_score
-                elif result.term.name == 'Second Term':
-                    self.second_term_total = result.total_score
-                elif result.term.name == 'Third Term':
-                    self.third_term_total = result.total_score
+                term__ordinal__in=(1, 2, 3),
+            )
+            # Exclude current record only once it exists (avoids "id <> NULL")
+            if self.pk is not None:
+                other_results = other_results.exclude(pk=self.pk)
+
+            for other_ordinal, other_total in other_results.values_list('term__ordinal', 'total_score'):
+                setattr(self, TERM_TOTAL_FIELDS[other_ordinal], other_total)
 
         # Collect all available term scores
         term_scores = []
@@ -774,12 +1141,16 @@ class ExamResult(models.Model):
             term_scores.append(float(self.third_term_total))
 
         # Calculate cumulative as AVERAGE of available terms
-        if term_scores:
+        if term_scores and term_scores != [current_total]:
             self.cumulative_score = sum(term_scores) / len(term_scores)
             self.cumulative_grade, _ = self.calculate_grade(self.cumulative_score)
         else:
+            # Only this term counts - cumulative equals the current total
             self.cumulative_score = current_total
-            self.cumulative_grade, _ = self.calculate_grade(current_total)
+            if precomputed_grade:
+                self.cumulative_grade = precomputed_grade[0]
+            else:
+                self.cumulative_grade, _ = self.calculate_grade(current_total)
     
     @staticmethod
     def calculate_grade(score):
@@ -788,20 +1159,65 @@ class ExamResult(models.Model):
         
         Returns: (grade, remark) tuple
         """
-        score = float(score) if score else 0
+        # Decimal, int and float scores compare directly with the integer
+        # band minimums - no float conversion needed
+        return GRADE_LOOKUP[bisect_right(GRADE_THRESHOLDS, score or 0)]
+    
+    @classmethod
+    def recompute_rankings(cls, session_id, term_id, class_level_id=None, subject_id=None):
+        """
+        Recompute position and class statistics within each class/subject
+        cohort of a session/term in a single UPDATE ... FROM using window
+        functions. RANK() gives tied scores the same position (1, 2, 2, 4).
         
-        if score >= 75:
-            return ('A', 'Excellent')
-        elif score >= 70:
-            return ('B', 'Very Good')
-        elif score >= 60:
-            return ('C', 'Good')
-        elif score >= 50:
-            return ('D', 'Pass')
-        elif score >= 45:
-            return ('E', 'Fair')
-        else:
-            return ('F', 'Fail')
+        Returns (results updated, class/subject cohorts ranked).
+        """
+        exam_table = cls._meta.db_table
+        student_table = ActiveStudent._meta.db_table
+        
+        params = [session_id, term_id]
+        filters = ''
+        if class_level_id:
+            filters += ' AND s.class_level_id = %s'
+            params.append(class_level_id)
+        if subject_id:
+            filters += ' AND r.subject_id = %s'
+            params.append(subject_id)
+        params.append(session_id)
+        
+        sql = f"""
+            UPDATE {exam_table} SET
+                position = stats.position,
+                class_average = stats.class_average,
+                total_students = stats.total_students,
+                highest_score = stats.highest_score,
+                lowest_score = stats.lowest_score
+            FROM (
+                SELECT
+                    r.id,
+                    RANK() OVER ranked AS position,
+                    ROUND(AVG(r.total_score) OVER cohort, 2) AS class_average,
+                    COUNT(*) OVER cohort AS total_students,
+                    MAX(r.total_score) OVER cohort AS highest_score,
+                    MIN(r.total_score) OVER cohort AS lowest_score
+                FROM {exam_table} r
+                JOIN {student_table} s ON s.id = r.student_id
+                WHERE r.session_id = %s AND r.term_id = %s
+                  AND s.class_level_id IS NOT NULL{filters}
+                WINDOW cohort AS (PARTITION BY s.class_level_id, r.subject_id),
+                       ranked AS (cohort ORDER BY r.total_score DESC)
+            ) AS stats
+            WHERE {exam_table}.id = stats.id
+              AND {exam_table}.session_id = %s
+            RETURNING {exam_table}.total_students
+        """
+        
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            cohort_sizes = [size for (size,) in cursor.fetchall()]
+        # A cohort of n results returns n rows of total_students = n, so
+        # each cohort adds exactly 1 to the sum of 1/n
+        return len(cohort_sizes), int(sum(Fraction(1, size) for size in cohort_sizes))
     
     @property
     def total_ca(self):
@@ -814,6 +1230,52 @@ class ExamResult(models.Model):
         return (self.obj_score or 0) + (self.theory_score or 0)
 
 
+class StudentCumulative(models.Model):
+    """
+    Read-only view over the mv_student_cumulative materialized view.
+
+    One row per (student, subject, session) with each term's total and the
+    cumulative average, pre-aggregated from ExamResult so report cards can
+    read a whole class in a single indexed SELECT.
+
+    PostgreSQL only - refreshed via utils.refresh_student_cumulative().
+    """
+
+    pk = models.CompositePrimaryKey('student', 'subject', 'session')
+    student = models.ForeignKey(
+        ActiveStudent,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+    )
+    subject = models.ForeignKey(
+        Subject,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+    )
+    session = models.ForeignKey(
+        AcademicSession,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+    )
+    first_term_total = models.DecimalField(max_digits=5, decimal_places=2, null=True)
+    second_term_total = models.DecimalField(max_digits=5, decimal_places=2, null=True)
+    third_term_total = models.DecimalField(max_digits=5, decimal_places=2, null=True)
+    cumulative_score = models.DecimalField(max_digits=5, decimal_places=2, null=True)
+    cumulative_grade = models.CharField(max_length=2, null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'mv_student_cumulative'
+        verbose_name = 'Student Cumulative'
+        verbose_name_plural = 'Student Cumulatives'
+
+    def __str__(self):
+        return f"{self.student_id} - {self.subject_id}: {self.cumulative_score} ({self.cumulative_grade})"
+
+
 # ==============================================================================
 # PROMOTION RULES (CONFIGURABLE)
 # ==============================================================================
@@ -902,7 +1364,24 @@ class PromotionRule(models.Model):
         class_str = self.class_level.name if self.class_level else "All Classes"
         return f"{self.session.name} - {class_str}: {self.pass_mark_percentage}%"
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._clear_compulsory_set()
+    
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._clear_compulsory_set()
+    
+    def _clear_compulsory_set(self):
+        # compulsory_subject_ids may have been reassigned or reloaded
+        self.__dict__.pop('compulsory_set', None)
+    
+    @cached_property
+    def compulsory_set(self):
+        """Compulsory subject IDs as a frozenset for O(1) membership checks"""
+        return frozenset(self.compulsory_subject_ids or ())
+    
     @property
     def total_minimum_subjects(self):
         """Total subjects needed to pass = compulsory + additional"""
-        return len(self.compulsory_subject_ids) + self.minimum_additional_subjects
\ No newline at end of file
+        return len(self.compulsory_set) + self.minimum_additional_subjects
\ No newline at end of file
@@ -1,13 +1,15 @@
 from rest_framework.permissions import BasePermission
 
+from .models import ADMIN_ROLES
+
 
 class IsAdminOrSuperAdmin(BasePermission):
     """Allow only admin or superadmin users"""
 
     def has_permission(self, request, view):
-        return (
-                request.user and
-                request.user.is_authenticated and
-                hasattr(request.user, 'role') and
-                request.user.role in ['admin', 'superadmin']
-        )
\ No newline at end of file
+        user = request.user
+        return bool(
+                user and
+                user.is_authenticated and
+                getattr(user, 'role', None) in ADMIN_ROLES
+        )
@@ -1,13 +1,17 @@
-import re
+import secrets
 from typing import Any, Dict
 
 from django.contrib.auth import authenticate
+from django.contrib.auth.models import update_last_login
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from .models import (
+    ADMIN_ROLES,
     AcademicSession,
     ActiveStudent,
     CAScore,
@@ -18,6 +22,7 @@ from .models import (
     Term,
     UserProfile,
 )
+from .utils import PHONE_NUMBER_RE
 
 
 # ==============================
@@ -43,12 +48,18 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         if user is None:
             raise serializers.ValidationError("Invalid credentials")
 
-        if user.role not in ["admin", "superadmin"]:
+        if user.role not in ADMIN_ROLES:
             raise serializers.ValidationError(
                 "Access denied. Admin credentials required."
             )
 
-        data = super().validate(attrs)
+        # Issue the pair for the user authenticated above rather than via
+        # super().validate(), which would verify the password hash again
+        self.user = user
+        refresh = self.get_token(user)
+        data = {"refresh": str(refresh), "access": str(refresh.access_token)}
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
 
         data["user"] = {
             "id": user.id,
@@ -101,9 +112,15 @@ class AdminProfileSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "is_active", "full_name", "created_at", "updated_at"]
+        # role maps to a ChoiceField over UserProfile.ROLE_CHOICES
+        extra_kwargs = {
+            "role": {
+                "error_messages": {"invalid_choice": "Role must be admin or superadmin"}
+            }
+        }
 
     def validate_phone_number(self, value: str) -> str:
-        if value and not re.match(r"^\+?1?\d{9,15}$", value):
+        if value and not PHONE_NUMBER_RE.match(value):
             raise serializers.ValidationError("Invalid phone number format")
         return value
 
@@ -112,11 +129,6 @@ class AdminProfileSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Age must be between 1 and 120")
         return value
 
-    def validate_role(self, value: str) -> str:
-        if value not in ["admin", "superadmin"]:
-            raise serializers.ValidationError("Role must be admin or superadmin")
-        return value
-
     def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
         request = self.context.get("request")
         if request and request.user.role == "admin":
@@ -133,8 +145,6 @@ class AdminProfileSerializer(serializers.ModelSerializer):
         if password:
             user.set_password(password)
         else:
-            import secrets
-
             temp_password = secrets.token_urlsafe(12)
             user.set_password(temp_password)
 
@@ -145,14 +155,17 @@ class AdminProfileSerializer(serializers.ModelSerializer):
         self, instance: UserProfile, validated_data: Dict[str, Any]
     ) -> UserProfile:
         password = validated_data.pop("password", None)
+        # Write only the submitted columns (auto_now needs updated_at listed)
+        update_fields = [*validated_data, "updated_at"]
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
         if password:
             instance.set_password(password)
+            update_fields.append("password")
 
-        instance.save()
+        instance.save(update_fields=update_fields)
         return instance
 
 
@@ -165,16 +178,18 @@ class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(write_only=True, required=True)
     new_password = serializers.CharField(write_only=True, required=True, min_length=8)
 
-    def validate_old_password(self, value: str) -> str:
-        user = self.context["request"].user
-        if not user.check_password(value):
-            raise serializers.ValidationError("Incorrect old password")
-        return value
-
     def validate_new_password(self, value: str) -> str:
         validate_password(value)
         return value
 
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        # Hash the old password last: DRF runs every field validator even
+        # after one fails, but only reaches validate() when all passed
+        user = self.context["request"].user
+        if not user.check_password(attrs["old_password"]):
+            raise serializers.ValidationError({"old_password": "Incorrect old password"})
+        return attrs
+
 
 # ==============================
 # PROFILE UPDATE SERIALIZER
@@ -203,7 +218,7 @@ class ProfileUpdateSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "username", "email", "full_name"]
 
     def validate_phone_number(self, value: str) -> str:
-        if value and not re.match(r"^\+?1?\d{9,15}$", value):
+        if value and not PHONE_NUMBER_RE.match(value):
             raise serializers.ValidationError("Invalid phone number format")
         return value
 
@@ -234,6 +249,11 @@ class TermSerializer(serializers.ModelSerializer):
             "created_at",
         ]
         read_only_fields = ["id", "created_at"]
+        # Only (session, name); Term.save() demotes the previous current
+        # term, so the one-current-term constraint must not reject is_current
+        validators = [
+            UniqueTogetherValidator(queryset=Term.objects.all(), fields=["session", "name"])
+        ]
 
 
 class AcademicSessionSerializer(serializers.ModelSerializer):
@@ -254,6 +274,8 @@ class AcademicSessionSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
+        # AcademicSession.save() demotes the previous current session
+        extra_kwargs = {"is_current": {"validators": []}}
 
 
 class ClassLevelSerializer(serializers.ModelSerializer):
@@ -268,8 +290,9 @@ class ClassLevelSerializer(serializers.ModelSerializer):
 class SubjectSerializer(serializers.ModelSerializer):
     """Serializer for subjects"""
 
-    class_levels_display = serializers.StringRelatedField(
-        source="class_levels", many=True, read_only=True
+    # Reads only the name column that Subject.with_levels() prefetches
+    class_levels_display = serializers.SlugRelatedField(
+        source="class_levels", slug_field="name", many=True, read_only=True
     )
 
     class Meta:
@@ -578,6 +601,11 @@ class ExamResultSerializer(serializers.ModelSerializer):
     term_name = serializers.SerializerMethodField()
     total_ca = serializers.SerializerMethodField()
     exam_total = serializers.SerializerMethodField()
+    
+    # Database-generated columns (declared explicitly: DRF has no mapping for GeneratedField)
+    total_score = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
+    grade = serializers.CharField(read_only=True)
+    remark = serializers.CharField(read_only=True)
 
     class Meta:
         model = ExamResult
@@ -790,24 +818,10 @@ class StudentLoginSerializer(serializers.Serializer):
     admission_number = serializers.CharField()
     password = serializers.CharField(write_only=True)
 
-    def validate(self, attrs):
-        from django.contrib.auth.hashers import check_password
-
-        admission_number = attrs.get("admission_number")
-        password = attrs.get("password")
-
-        try:
-            student = ActiveStudent.objects.get(
-                admission_number=admission_number.upper(), is_active=True
-            )
-        except ActiveStudent.DoesNotExist:
-            raise serializers.ValidationError("Invalid credentials")
-
-        if not check_password(password, student.password_hash):
-            raise serializers.ValidationError("Invalid credentials")
-
-        attrs["student"] = student
-        return attrs
+    def validate_admission_number(self, value):
+        # The password is checked once, by StudentLoginView, against the
+        # row it loads for the portal response
+        return value.upper()
 
         
 # ==============================
@@ -935,7 +949,7 @@ class StudentProfileUpdateSerializer(serializers.ModelSerializer):
         return value
 
     def validate_phone_number(self, value):
-        if value and not re.match(r"^\+?1?\d{9,15}$", value):
+        if value and not PHONE_NUMBER_RE.match(value):
             raise serializers.ValidationError("Invalid phone number format")
         return value
 
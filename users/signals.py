@@ -1,8 +1,15 @@
 from django.contrib.auth import get_user_model
 from django.db.models.signals import post_migrate
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import Student
+from .cache_utils import (
+    invalidate_class_level_cache,
+    invalidate_session_cache,
+    invalidate_term_cache,
+    invalidate_user_cache,
+)
+from .models import AcademicSession, ClassLevel, Student, Term, UserProfile
+from .utils import create_exam_result_partition
 import logging
 from decouple import config
 
@@ -35,6 +42,40 @@ def send_student_credentials_to_parent(sender, instance, created, **kwargs):
 
         # Clear temp password after use
         instance._raw_password = None
+
+
+@receiver(post_save, sender=AcademicSession)
+def create_exam_result_partition_for_session(sender, instance, created, **kwargs):
+    if created:
+        create_exam_result_partition(instance.pk)
+
+
+@receiver(post_save, sender=AcademicSession)
+@receiver(post_delete, sender=AcademicSession)
+def invalidate_cached_sessions(sender, instance, **kwargs):
+    # Also covers admin edits, which bypass the API views' invalidation
+    invalidate_session_cache()
+
+
+@receiver(post_save, sender=Term)
+@receiver(post_delete, sender=Term)
+def invalidate_cached_terms(sender, instance, **kwargs):
+    invalidate_term_cache(instance.session_id)
+
+
+@receiver(post_save, sender=ClassLevel)
+@receiver(post_delete, sender=ClassLevel)
+def invalidate_cached_class_levels(sender, instance, **kwargs):
+    invalidate_class_level_cache()
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Role, is_active and password changes must reach JWT authentication
+    invalidate_user_cache(instance.pk)
+
+
 @receiver(post_migrate)
 def create_superuser(sender, **kwargs):
     if sender.name != "django.contrib.auth":
@@ -1,3 +1,223 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+
+from .models import (
+    AcademicSession,
+    ActiveStudent,
+    AdmissionCounter,
+    ClassLevel,
+    ExamResult,
+    Subject,
+    Term,
+)
+from .utils import generate_admission_numbers
+
+
+# Student saves hash a generated password; Argon2 would dominate the run time
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+def make_student(class_level, first_name='Ada', **kwargs):
+    return ActiveStudent.objects.create(
+        first_name=first_name, last_name='Obi', gender='F',
+        class_level=class_level, **kwargs
+    )
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class AdmissionCounterTests(TestCase):
+    """AdmissionCounter.reserve() and bulk enrolment numbering"""
+
+    def setUp(self):
+        self.class_level = ClassLevel.objects.create(name='JSS1', order=1)
+
+    def test_first_reservation_of_a_year_starts_at_one(self):
+        self.assertEqual(AdmissionCounter.reserve(2031), 1)
+        self.assertEqual(AdmissionCounter.objects.get(year=2031).last_number, 1)
+
+    def test_first_reservation_seeds_from_numbers_already_issued(self):
+        make_student(self.class_level, admission_number='MOL/2031/007')
+        make_student(self.class_level, admission_number='MOL/2030/050')
+
+        self.assertEqual(AdmissionCounter.reserve(2031), 8)
+
+    def test_reservations_are_consecutive_blocks(self):
+        self.assertEqual(AdmissionCounter.reserve(2031, 3), 1)
+        self.assertEqual(AdmissionCounter.reserve(2031), 4)
+        self.assertEqual(AdmissionCounter.reserve(2031, 2), 5)
+        self.assertEqual(AdmissionCounter.objects.get(year=2031).last_number, 6)
+
+    def test_save_assigns_the_next_number(self):
+        first = make_student(self.class_level)
+        second = make_student(self.class_level)
+
+        year = date.today().year
+        self.assertEqual(first.admission_number, f'MOL/{year}/001')
+        self.assertEqual(second.admission_number, f'MOL/{year}/002')
+
+    def test_bulk_enroll_numbers_the_batch_in_order(self):
+        make_student(self.class_level)
+        students = [
+            ActiveStudent(first_name=name, last_name='Obi', gender='M', class_level=self.class_level)
+            for name in ('Bayo', 'Chidi', 'Dayo')
+        ]
+
+        created = ActiveStudent.objects.bulk_enroll(students)
+
+        year = date.today().year
+        self.assertEqual(
+            [student.admission_number for student in created],
+            [f'MOL/{year}/002', f'MOL/{year}/003', f'MOL/{year}/004'],
+        )
+        self.assertTrue(all(student.password_hash for student in created))
+
+    def test_failed_bulk_enroll_hands_its_numbers_back(self):
+        existing = make_student(self.class_level)
+        students = [
+            ActiveStudent(first_name='Bayo', last_name='Obi', gender='M', class_level=self.class_level),
+            # Collides with an enrolled student, so the whole insert fails
+            ActiveStudent(
+                first_name='Chidi', last_name='Obi', gender='M', class_level=self.class_level,
+                admission_number=existing.admission_number,
+            ),
+        ]
+
+        with self.assertRaises(IntegrityError):
+            ActiveStudent.objects.bulk_enroll(students)
+
+        year = date.today().year
+        self.assertEqual(ActiveStudent.objects.count(), 1)
+        self.assertEqual(generate_admission_numbers(1), [f'MOL/{year}/002'])
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ExamResultTestCase(TestCase):
+    """A session with two terms, one class and one subject"""
+
+    def setUp(self):
+        self.session = AcademicSession.objects.create(
+            name='2030/2031', start_date='2030-09-01', end_date='2031-07-01'
+        )
+        self.first_term = Term.objects.create(
+            session=self.session, name='First Term',
+            start_date='2030-09-01', end_date='2030-12-15',
+        )
+        self.second_term = Term.objects.create(
+            session=self.session, name='Second Term',
+            start_date='2031-01-05', end_date='2031-04-10',
+        )
+        self.class_level = ClassLevel.objects.create(name='JSS1', order=1)
+        self.subject = Subject.objects.create(name='Mathematics', code='MTH')
+
+    def add_result(self, student, total, term=None, subject=None):
+        # CA1 10 + CA2 10 + OBJ 20, theory makes up the rest
+        return ExamResult.objects.create(
+            student=student, subject=subject or self.subject,
+            session=self.session, term=term or self.first_term,
+            ca1_score=10, ca2_score=10, obj_score=20, theory_score=total - 40,
+        )
+
+
+class RecomputeRankingsTests(ExamResultTestCase):
+    """ExamResult.recompute_rankings()"""
+
+    def test_tied_scores_share_a_position(self):
+        scores = {'Ada': 80, 'Bola': 70, 'Chi': 70, 'Dapo': 60}
+        results = {
+            name: self.add_result(make_student(self.class_level, first_name=name), total)
+            for name, total in scores.items()
+        }
+
+        counts = ExamResult.recompute_rankings(self.session.id, self.first_term.id)
+
+        self.assertEqual(counts, (4, 1))
+        positions = {
+            name: ExamResult.objects.get(pk=result.pk).position
+            for name, result in results.items()
+        }
+        self.assertEqual(positions, {'Ada': 1, 'Bola': 2, 'Chi': 2, 'Dapo': 4})
+
+        ranked = ExamResult.objects.get(pk=results['Dapo'].pk)
+        self.assertEqual(ranked.total_students, 4)
+        self.assertEqual(ranked.class_average, Decimal('70.00'))
+        self.assertEqual(ranked.highest_score, Decimal('80.00'))
+        self.assertEqual(ranked.lowest_score, Decimal('60.00'))
+
+    def test_each_class_and_subject_is_ranked_separately(self):
+        other_class = ClassLevel.objects.create(name='JSS2', order=2)
+        other_subject = Subject.objects.create(name='English', code='ENG')
+        top = self.add_result(make_student(self.class_level), 50)
+        self.add_result(top.student, 90, subject=other_subject)
+        other = self.add_result(make_student(other_class), 40)
+
+        counts = ExamResult.recompute_rankings(self.session.id, self.first_term.id)
+
+        self.assertEqual(counts, (3, 3))
+        self.assertEqual(ExamResult.objects.get(pk=top.pk).position, 1)
+        self.assertEqual(ExamResult.objects.get(pk=other.pk).position, 1)
+
+    def test_class_level_filter_limits_the_update(self):
+        other_class = ClassLevel.objects.create(name='JSS2', order=2)
+        self.add_result(make_student(self.class_level), 50)
+        other = self.add_result(make_student(other_class), 40)
+
+        counts = ExamResult.recompute_rankings(
+            self.session.id, self.first_term.id, self.class_level.id
+        )
+
+        self.assertEqual(counts, (1, 1))
+        self.assertIsNone(ExamResult.objects.get(pk=other.pk).position)
+
+
+class CumulativeScoreTests(ExamResultTestCase):
+    """Cumulative columns written by ExamResult.save()"""
+
+    def setUp(self):
+        super().setUp()
+        self.student = make_student(self.class_level)
+
+    def test_single_term_cumulative_is_the_term_total(self):
+        result = self.add_result(self.student, 60)
+
+        result = ExamResult.objects.get(pk=result.pk)
+        self.assertEqual(result.first_term_total, Decimal('60.00'))
+        self.assertEqual(result.cumulative_score, Decimal('60.00'))
+        self.assertEqual(result.cumulative_grade, 'C')
+
+    def test_second_term_averages_and_updates_the_first(self):
+        first = self.add_result(self.student, 60)
+        second = self.add_result(self.student, 70, term=self.second_term)
+
+        for result in (ExamResult.objects.get(pk=first.pk), ExamResult.objects.get(pk=second.pk)):
+            self.assertEqual(result.first_term_total, Decimal('60.00'))
+            self.assertEqual(result.second_term_total, Decimal('70.00'))
+            self.assertEqual(result.cumulative_score, Decimal('65.00'))
+            self.assertEqual(result.cumulative_grade, 'C')
+
+    def test_score_change_cascades_to_peer_terms(self):
+        first = self.add_result(self.student, 60)
+        second = self.add_result(self.student, 70, term=self.second_term)
+
+        first.theory_score = 40  # total 80
+        first.save()
+
+        self.assertEqual(first.total_score, Decimal('80.00'))
+        self.assertEqual(first.grade, 'A')
+        second = ExamResult.objects.get(pk=second.pk)
+        self.assertEqual(second.first_term_total, Decimal('80.00'))
+        self.assertEqual(second.cumulative_score, Decimal('75.00'))
+        self.assertEqual(second.cumulative_grade, 'A')
+
+    def test_non_score_edit_leaves_cumulative_alone(self):
+        first = self.add_result(self.student, 60)
+        second = self.add_result(self.student, 70, term=self.second_term)
+        first = ExamResult.objects.get(pk=first.pk)
+
+        first.total_obj_questions = 40
+        with self.assertNumQueries(1):
+            first.save()
+
+        self.assertEqual(ExamResult.objects.get(pk=second.pk).cumulative_score, Decimal('65.00'))
@@ -1,32 +1,39 @@
-import random
+import re
+import secrets
 import string
 from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import connection, transaction
+from django.db.models import Avg, Case, Max, When
 
 
 def generate_admission_number():
     """Generate unique admission number: MOL/YYYY/XXX"""
-    from .models import ActiveStudent
+    return generate_admission_numbers(1)[0]
+
+
+def generate_admission_numbers(count):
+    """Reserve count consecutive admission numbers for the current year"""
+    from .models import AdmissionCounter
 
+    if not count:
+        return []
     year = datetime.now().year
+    first = AdmissionCounter.reserve(year, count)
+    return [f'MOL/{year}/{number:03d}' for number in range(first, first + count)]
 
-    last_student = ActiveStudent.objects.filter(
-        admission_number__startswith=f'MOL/{year}/'
-    ).order_by('-admission_number').first()
 
-    if last_student:
-        last_num = int(last_student.admission_number.split('/')[-1])
-        new_num = last_num + 1
-    else:
-        new_num = 1
+# Optional +, optional leading 1, then 9-15 digits
+PHONE_NUMBER_RE = re.compile(r'^\+?1?\d{9,15}$')
 
-    return f'MOL/{year}/{new_num:03d}'
+# Letters and digits minus the look-alikes (I, O, i, l, o, 0, 1)
+PASSWORD_CHARS = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789abcdefghjkmnpqrstuvwxyz'
 
 
 def generate_password(length=8):
     """Generate secure random password"""
-    chars = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789abcdefghjkmnpqrstuvwxyz'
-    password = ''.join(random.choice(chars) for _ in range(length))
-    return password
+    return ''.join(secrets.choice(PASSWORD_CHARS) for _ in range(length))
 
 
 def calculate_grade(percentage):
@@ -74,4 +81,143 @@ def calculate_position_and_stats(student, subject, session, term):
         'class_average': class_average,
         'highest_score': highest_score,
         'lowest_score': lowest_score
-    }
\ No newline at end of file
+    }
+
+
+CUMULATIVE_FIELDS = (
+    'student_id', 'subject_id', 'session_id',
+    'first_term_total', 'second_term_total', 'third_term_total',
+    'cumulative_score', 'cumulative_grade',
+)
+
+
+# Score columns of mv_student_cumulative (numeric, 2 places on PostgreSQL)
+CUMULATIVE_SCORE_FIELDS = (
+    'first_term_total', 'second_term_total', 'third_term_total', 'cumulative_score',
+)
+TWO_PLACES = Decimal('0.01')
+
+
+def grade_case_sql(score_sql):
+    """SQL CASE mapping score_sql to its letter grade, built from GRADE_BANDS"""
+    from .models import FAIL_BAND, GRADE_BANDS
+
+    whens = ''.join(
+        f"\n        WHEN {score_sql} >= {minimum} THEN '{grade}'"
+        for minimum, grade, _ in GRADE_BANDS
+    )
+    return f"CASE{whens}\n        ELSE '{FAIL_BAND[0]}'\n    END"
+
+
+def student_cumulative_view_sql():
+    """
+    CREATE statements for the mv_student_cumulative materialized view.
+
+    Term columns are keyed on Term.ordinal (TERM_TOTAL_FIELDS) and the grade
+    comes from GRADE_BANDS, so the view matches ExamResult's own cumulative
+    columns. Changing either needs a migration that recreates the view.
+    """
+    from .models import TERM_TOTAL_FIELDS
+
+    term_columns = ''.join(
+        f"    MAX(CASE WHEN t.ordinal = {ordinal} THEN er.total_score END) AS {field},\n"
+        for ordinal, field in enumerate(TERM_TOTAL_FIELDS) if field
+    )
+    return f"""
+CREATE MATERIALIZED VIEW mv_student_cumulative AS
+SELECT
+    er.student_id,
+    er.subject_id,
+    er.session_id,
+{term_columns}    ROUND(AVG(er.total_score), 2) AS cumulative_score,
+    {grade_case_sql('AVG(er.total_score)')} AS cumulative_grade
+FROM users_examresult er
+JOIN users_term t ON t.id = er.term_id
+GROUP BY er.student_id, er.subject_id, er.session_id
+WITH DATA;
+
+CREATE UNIQUE INDEX mv_student_cumulative_uniq
+    ON mv_student_cumulative (student_id, subject_id, session_id);
+CREATE INDEX mv_student_cumulative_student_session_idx
+    ON mv_student_cumulative (student_id, session_id);
+CREATE INDEX mv_student_cumulative_session_subject_idx
+    ON mv_student_cumulative (session_id, subject_id);
+"""
+
+
+def refresh_student_cumulative():
+    """Refresh the mv_student_cumulative materialized view (PostgreSQL only)"""
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('REFRESH MATERIALIZED VIEW CONCURRENTLY mv_student_cumulative')
+
+
+def schedule_student_cumulative_refresh():
+    """
+    Refresh mv_student_cumulative once the current transaction commits.
+
+    Called once per score upload / recalculation request; single-result
+    edits (admin, API) show up in the view with the next upload.
+    """
+    transaction.on_commit(refresh_student_cumulative)
+
+
+def create_exam_result_partition(session_id):
+    """
+    Create the ExamResult partition for an academic session.
+
+    No-op unless the table is partitioned (PostgreSQL, see migration 0011);
+    sessions without one still land in the DEFAULT partition.
+    """
+    from .models import ExamResult
+
+    if connection.vendor != 'postgresql':
+        return
+    qn = connection.ops.quote_name
+    table = ExamResult._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_class WHERE relname = %s AND relkind = 'p'", [table]
+        )
+        if cursor.fetchone() is None:
+            return
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {qn(f"{table}_s{int(session_id)}")} '
+            f'PARTITION OF {qn(table)} FOR VALUES IN ({int(session_id)})'
+        )
+
+
+def get_student_cumulative(**filters):
+    """
+    Per (student, subject, session) term totals and cumulative average.
+
+    Reads the mv_student_cumulative materialized view on PostgreSQL and
+    falls back to aggregating ExamResult on other backends. Filters use
+    the field names shared by both (student, subject, session).
+    Returns a list of dicts keyed by CUMULATIVE_FIELDS.
+    """
+    from .models import ExamResult, StudentCumulative
+
+    if connection.vendor == 'postgresql':
+        return list(StudentCumulative.objects.filter(**filters).values(*CUMULATIVE_FIELDS))
+
+    rows = ExamResult.objects.filter(**filters).values(
+        'student_id', 'subject_id', 'session_id'
+    ).annotate(
+        first_term_total=Max(Case(When(term__name='First Term', then='total_score'))),
+        second_term_total=Max(Case(When(term__name='Second Term', then='total_score'))),
+        third_term_total=Max(Case(When(term__name='Third Term', then='total_score'))),
+        cumulative_score=Avg('total_score'),
+    ).order_by()
+
+    results = []
+    for row in rows:
+        # Grade from the unrounded average, like the view's CASE
+        row['cumulative_grade'] = ExamResult.calculate_grade(row['cumulative_score'])[0]
+        # Same Decimal scale and rounding as the view's numeric columns
+        for field in CUMULATIVE_SCORE_FIELDS:
+            if row[field] is not None:
+                row[field] = Decimal(str(row[field])).quantize(TWO_PLACES, ROUND_HALF_UP)
+        results.append(row)
+    return results
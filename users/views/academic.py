@@ -42,7 +42,7 @@ class AcademicSessionViewSet(viewsets.ModelViewSet):
     - Create/Update/Delete sessions
     - Set a session as current (deactivates others)
     """
-    queryset = AcademicSession.objects.all()
+    queryset = AcademicSession.objects.with_terms()
     serializer_class = AcademicSessionSerializer
     permission_classes = [IsAuthenticated, IsAdminOrSuperAdmin]
     ordering = ['-start_date']
@@ -196,7 +196,7 @@ class SubjectViewSet(viewsets.ModelViewSet):
     - Search by name, code
     - Filter by is_active
     """
-    queryset = Subject.objects.prefetch_related('class_levels').all()
+    queryset = Subject.objects.with_levels()
     serializer_class = SubjectSerializer
     permission_classes = [IsAuthenticated, IsAdminOrSuperAdmin]
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
@@ -205,7 +205,7 @@ class SubjectViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Optimized queryset with prefetch_related"""
-        return Subject.objects.prefetch_related('class_levels').all()
+        return Subject.objects.with_levels()
     
     def list(self, request, *args, **kwargs):
         """Return cached list of subjects"""
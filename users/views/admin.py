@@ -11,7 +11,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 
-from ..models import UserProfile
+from ..models import ADMIN_ROLES, UserProfile
 from ..serializers import (
     AdminProfileSerializer,
     ChangePasswordSerializer,
@@ -41,7 +41,7 @@ class AdminViewSet(viewsets.ModelViewSet):
     serializer_class = AdminProfileSerializer
     permission_classes = [IsAuthenticated, IsAdminOrSuperAdmin]
     filter_backends = [filters.SearchFilter, DjangoFilterBackend, filters.OrderingFilter]
-    search_fields = ['username', 'email', 'first_name', 'last_name']
+    search_fields = ['username', 'email', 'full_name']
     filterset_fields = ['role', 'is_active']
     ordering_fields = ['created_at', 'username', 'email']
     ordering = ['-created_at']
@@ -52,7 +52,7 @@ class AdminViewSet(viewsets.ModelViewSet):
         """
         return UserProfile.objects.filter(
             is_active=True,
-            role__in=['admin', 'superadmin']
+            role__in=ADMIN_ROLES
         ).only(
             'id', 'username', 'email', 'first_name', 'last_name',
             'role', 'phone_number', 'is_active', 'created_at'
@@ -112,12 +112,16 @@ class ProfileView(APIView):
     """
     permission_classes = [IsAuthenticated]
     
+    def get_object(self):
+        """Load the full row; request.user only carries the cached auth fields"""
+        return UserProfile.objects.get(pk=self.request.user.pk)
+    
     def get(self, request):
         """Get current user's profile"""
         cache_key = make_cache_key('profile', request.user.id)
         
         def get_profile():
-            serializer = AdminProfileSerializer(request.user)
+            serializer = AdminProfileSerializer(self.get_object())
             return serializer.data
         
         data = get_or_set_cache(cache_key, get_profile, timeout=CACHE_TIMEOUT_STUDENT)
@@ -126,7 +130,7 @@ class ProfileView(APIView):
     def put(self, request):
         """Full update of profile"""
         serializer = ProfileUpdateSerializer(
-            request.user,
+            self.get_object(),
             data=request.data,
             partial=False,
             context={'request': request}
@@ -141,7 +145,7 @@ class ProfileView(APIView):
     def patch(self, request):
         """Partial update of profile"""
         serializer = ProfileUpdateSerializer(
-            request.user,
+            self.get_object(),
             data=request.data,
             partial=True,
             context={'request': request}
@@ -172,7 +176,8 @@ class ChangePasswordView(APIView):
         if serializer.is_valid():
             user = request.user
             user.set_password(serializer.validated_data['new_password'])
-            user.save()
+            # request.user is the partial cached instance (get_cached_user)
+            user.save(update_fields=['password'])
             logger.info(f"Password changed for user: {user.username}")
             return Response(
                 {'detail': 'Password changed successfully'},
@@ -11,7 +11,9 @@ Updated for Nigerian Secondary School Grading:
 """
 import logging
 from decimal import Decimal
-from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.hashers import (
+    check_password, get_hasher, identify_hasher, make_password,
+)
 from django.db.models import Avg, Max, Min, Count, Sum
 from rest_framework import status
 from rest_framework.permissions import AllowAny
@@ -38,6 +40,7 @@ from ..cache_utils import (
     get_cached_terms,
     CACHE_TIMEOUT_STUDENT,
 )
+from ..utils import get_student_cumulative
 
 logger = logging.getLogger(__name__)
 
@@ -87,34 +90,22 @@ def get_grade(score):
     - E: 45-49 (Fair)
     - F: 0-44 (Fail)
     """
-    score = float(score) if score else 0
-    if score >= 75:
-        return 'A'
-    elif score >= 70:
-        return 'B'
-    elif score >= 60:
-        return 'C'
-    elif score >= 50:
-        return 'D'
-    elif score >= 45:
-        return 'E'
-    return 'F'
+    return ExamResult.calculate_grade(score)[0]
 
 
 def get_remark(score):
     """Get remark based on Nigerian grading scale"""
-    score = float(score) if score else 0
-    if score >= 75:
-        return 'Excellent'
-    elif score >= 70:
-        return 'Very Good'
-    elif score >= 60:
-        return 'Good'
-    elif score >= 50:
-        return 'Pass'
-    elif score >= 45:
-        return 'Fair'
-    return 'Fail'
+    return ExamResult.calculate_grade(score)[1]
+
+
+def password_hash_needs_upgrade(encoded):
+    """True if ``encoded`` was not made by the current preferred hasher settings"""
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return True
+    preferred = get_hasher('default')
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
 
 
 class StudentLoginView(APIView):
@@ -130,7 +121,7 @@ class StudentLoginView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        admission_number = serializer.validated_data['admission_number'].upper()
+        admission_number = serializer.validated_data['admission_number']
         password = serializer.validated_data['password']
         
         try:
@@ -146,7 +137,23 @@ class StudentLoginView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        if student.password_plain == password or check_password(password, student.password_hash):
+        def upgrade_password_hash(raw_password):
+            # Re-hash with the preferred hasher (Argon2) after a successful login
+            student.password_hash = make_password(raw_password)
+            student.save(update_fields=['password_hash'])
+        
+        if student.password_plain == password:
+            # The plain-text match skips check_password(), so upgrade
+            # outdated hashes here instead of through its setter
+            if password_hash_needs_upgrade(student.password_hash):
+                upgrade_password_hash(password)
+            authenticated = True
+        else:
+            authenticated = check_password(
+                password, student.password_hash, setter=upgrade_password_hash
+            )
+        
+        if authenticated:
             logger.info(f"Student login successful: {admission_number}")
             return Response({
                 'message': 'Login successful',
@@ -689,30 +696,45 @@ class StudentReportCardView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        terms = Term.objects.filter(session=session).order_by('id')
+        terms = list(Term.objects.filter(session=session).order_by('id'))
         
-        # Get unique subjects for this student in this session (deduplicate by subject_id)
-        subjects_in_session = ExamResult.objects.filter(
+        # All of this student's results for the session in one query
+        student_results = ExamResult.objects.filter(
             student=student, session=session
-        ).values_list('subject_id', flat=True).distinct()
+        ).select_related('subject', 'term')
         
-        # Get the student's class level for class average calculations
+        results_by_subject = {}
+        for result in student_results:
+            results_by_subject.setdefault(
+                result.subject_id, {'name': result.subject.name, 'terms': {}}
+            )['terms'][result.term_id] = result
+        
+        # Class cumulative averages for every subject at once, read from the
+        # pre-aggregated mv_student_cumulative view (one row per student/subject)
         student_class = student.class_level
+        class_cumulatives = {}
+        if student_class and results_by_subject:
+            rows = get_student_cumulative(
+                session_id=session.id,
+                subject_id__in=list(results_by_subject),
+                student__class_level=student_class,
+                student__is_active=True,
+            )
+            for row in sorted(rows, key=lambda r: r['student_id']):
+                if row['cumulative_score'] is None:
+                    continue
+                class_cumulatives.setdefault(row['subject_id'], []).append({
+                    'student_id': row['student_id'],
+                    'avg': round(float(row['cumulative_score']), 2)
+                })
         
         cumulative_subjects = []
         
-        for subject_id in subjects_in_session:
-            # Get subject name from any result for this subject
-            subject_obj = Subject.objects.get(id=subject_id)
-            subject_name = subject_obj.name
-            
+        for subject_id, subject_data in results_by_subject.items():
             term_scores = {}
             
             for term in terms:
-                result = ExamResult.objects.filter(
-                    student=student, session=session, term=term,
-                    subject_id=subject_id
-                ).first()
+                result = subject_data['terms'].get(term.id)
                 
                 if result:
                     term_scores[term.name] = {
@@ -732,53 +754,27 @@ class StudentReportCardView(APIView):
             num_terms = len(valid_totals)
             cumulative_avg = cumulative_total / num_terms if num_terms else 0
             
-            # Calculate CLASS AVERAGE for this subject (cumulative across all students in same class)
+            # Class average and position (cumulative across all students in same class)
             class_avg = None
             student_position = None
             total_students_in_class = None
             
-            if student_class:
-                # Get all students in this class who took this subject this session
-                class_results = ExamResult.objects.filter(
-                    session=session,
-                    subject_id=subject_id,
-                    student__class_level=student_class,
-                    student__is_active=True,
+            class_cumulative_avgs = class_cumulatives.get(subject_id)
+            if class_cumulative_avgs:
+                total_students_in_class = len(class_cumulative_avgs)
+                class_avg = round(
+                    sum(s['avg'] for s in class_cumulative_avgs) / total_students_in_class, 1
                 )
                 
-                # Build cumulative average for each student in the class
-                student_ids = class_results.values_list('student_id', flat=True).distinct()
-                class_cumulative_avgs = []
-                
-                for sid in student_ids:
-                    student_term_totals = []
-                    for term in terms:
-                        r = class_results.filter(student_id=sid, term=term).first()
-                        if r and r.total_score is not None:
-                            student_term_totals.append(float(r.total_score))
-                    
-                    if student_term_totals:
-                        s_avg = sum(student_term_totals) / len(student_term_totals)
-                        class_cumulative_avgs.append({
-                            'student_id': sid,
-                            'avg': round(s_avg, 2)
-                        })
-                
-                if class_cumulative_avgs:
-                    total_students_in_class = len(class_cumulative_avgs)
-                    class_avg = round(
-                        sum(s['avg'] for s in class_cumulative_avgs) / total_students_in_class, 1
-                    )
-                    
-                    # Sort descending to determine position
-                    class_cumulative_avgs.sort(key=lambda x: x['avg'], reverse=True)
-                    for idx, entry in enumerate(class_cumulative_avgs, 1):
-                        if entry['student_id'] == student.id:
-                            student_position = idx
-                            break
+                # Sort descending to determine position
+                class_cumulative_avgs.sort(key=lambda x: x['avg'], reverse=True)
+                for idx, entry in enumerate(class_cumulative_avgs, 1):
+                    if entry['student_id'] == student.id:
+                        student_position = idx
+                        break
             
             cumulative_subjects.append({
-                'subjectName': subject_name,
+                'subjectName': subject_data['name'],
                 'termScores': term_scores,
                 'cumulativeTotal': round(cumulative_total, 1),
                 'termsCompleted': num_terms,
@@ -39,6 +39,8 @@ def _get_next_class_level(current_class):
 def _get_promotion_rules(session_id, class_level_name):
     """
     Fetch rules: class-specific → global → hardcoded defaults.
+    'compulsory_ids' is compulsory_subject_ids as a frozenset, built once
+    for the per-result membership checks.
     """
     rule = PromotionRule.objects.filter(
         session_id=session_id, class_level__name=class_level_name, is_active=True
@@ -53,6 +55,7 @@ def _get_promotion_rules(session_id, class_level_name):
             'rule_id': rule.id,
             'pass_mark_percentage': float(rule.pass_mark_percentage),
             'compulsory_subject_ids': rule.compulsory_subject_ids or [],
+            'compulsory_ids': rule.compulsory_set,
             'minimum_additional_subjects': rule.minimum_additional_subjects,
             'promotion_mode': rule.promotion_mode,
             'allow_carryover': rule.allow_carryover,
@@ -68,10 +71,12 @@ def _get_promotion_rules(session_id, class_level_name):
         Q(name__icontains='english')
     ).values_list('id', flat=True).first()
 
+    compulsory_subject_ids = [x for x in [math_id, english_id] if x]
     return {
         'rule_id': None,
         'pass_mark_percentage': 50.0,
-        'compulsory_subject_ids': [x for x in [math_id, english_id] if x],
+        'compulsory_subject_ids': compulsory_subject_ids,
+        'compulsory_ids': frozenset(compulsory_subject_ids),
         'minimum_additional_subjects': 5,
         'promotion_mode': 'recommend',
         'allow_carryover': False,
@@ -121,7 +126,7 @@ def _check_student_promotion(student, session, rules):
             'cumulative_average': 0, 'term_used': None,
         }
 
-    compulsory_ids = rules['compulsory_subject_ids']
+    compulsory_ids = rules['compulsory_ids']
     details = []
     comp_results = []
     other_results = []
@@ -201,6 +206,7 @@ def get_promotion_rules(request):
     if not session_id:
         return Response({'error': 'session_id is required'}, status=status.HTTP_400_BAD_REQUEST)
     rules = _get_promotion_rules(session_id, class_level_name)
+    rules.pop('compulsory_ids')  # frozenset, internal only
     comp_names = list(Subject.objects.filter(id__in=rules['compulsory_subject_ids']).values_list('name', flat=True))
     return Response({
         'success': True,
@@ -22,6 +22,7 @@ from decimal import Decimal
 
 from django.db import transaction
 from django.db.models import Avg
+from django.db.models.functions import Lower
 from django.http import HttpResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
@@ -30,7 +31,8 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
 from ..models import (
-    ActiveStudent, AcademicSession, Term, Subject, CAScore, ExamResult
+    ActiveStudent, AcademicSession, Term, Subject, CAScore, ExamResult,
+    CUMULATIVE_RESULT_FIELDS, TERM_TOTAL_FIELDS,
 )
 from ..serializers import (
     CAScoreSerializer,
@@ -40,9 +42,16 @@ from ..permissions import IsAdminOrSuperAdmin
 from ..cache_utils import (
     invalidate_score_cache,
 )
+from ..utils import schedule_student_cumulative_refresh
 
 logger = logging.getLogger(__name__)
 
+ZERO = Decimal('0')
+TWO_PLACES = Decimal('0.01')
+
+# Columns a CA upload overwrites on existing CAScore rows
+CA_UPLOAD_FIELDS = ['ca1_score', 'ca2_score', 'uploaded_by']
+
 
 def get_grade(score):
     """
@@ -50,19 +59,7 @@ def get_grade(score):
     
     Returns: (grade, remark) tuple
     """
-    score = float(score) if score else 0
-    if score >= 75:
-        return ('A', 'Excellent')
-    elif score >= 70:
-        return ('B', 'Very Good')
-    elif score >= 60:
-        return ('C', 'Good')
-    elif score >= 50:
-        return ('D', 'Pass')
-    elif score >= 45:
-        return ('E', 'Fair')
-    else:
-        return ('F', 'Fail')
+    return ExamResult.calculate_grade(score)
 
 
 # ==============================================================================
@@ -128,18 +125,20 @@ def _prefetch_students_and_subjects(rows):
         if subj:
             subject_names.add(subj)
 
+    # Rows only need the student as a foreign key
     students_map = {
         s.admission_number: s
         for s in ActiveStudent.objects.filter(
             admission_number__in=admission_numbers, is_active=True
-        )
+        ).only('id', 'admission_number')
     }
 
     subjects_map = {}
     if subject_names:
-        for s in Subject.objects.all():
-            if s.name.lower() in {n.lower() for n in subject_names}:
-                subjects_map[s.name.lower()] = s
+        for s in Subject.objects.annotate(name_lower=Lower('name')).filter(
+            name_lower__in={n.lower() for n in subject_names}
+        ):
+            subjects_map[s.name_lower] = s
 
     return students_map, subjects_map
 
@@ -184,9 +183,7 @@ class CAScoreViewSet(viewsets.ModelViewSet):
     filterset_fields = ['student', 'subject', 'session', 'term']
     
     def get_queryset(self):
-        queryset = CAScore.objects.select_related(
-            'student', 'student__class_level', 'subject', 'session', 'term', 'uploaded_by'
-        ).all()
+        queryset = CAScore.objects.for_display().order_by('-created_at')
         
         class_level = self.request.query_params.get('class_level')
         if class_level:
@@ -215,17 +212,13 @@ class CAScoreViewSet(viewsets.ModelViewSet):
 
         created, updated, subjects_created = 0, 0, 0
         errors = []
-        to_create = []
-        to_update = []
+        to_ingest = {}
 
         with transaction.atomic():
-            # Pre-fetch existing CA scores for this session/term in one query
-            existing_scores = {
-                (ca.student_id, ca.subject_id): ca
-                for ca in CAScore.objects.filter(
-                    session=session, term=term
-                ).select_for_update()
-            }
+            # Keys already stored for this session/term, only for the counts
+            existing_keys = set(
+                CAScore.objects.filter(session=session, term=term).values_list('student_id', 'subject_id')
+            )
 
             for idx, row in enumerate(rows, start=2):
                 try:
@@ -252,33 +245,23 @@ class CAScoreViewSet(viewsets.ModelViewSet):
                         subjects_created += 1
 
                     key = (student.id, subject.id)
-                    existing = existing_scores.get(key)
-
-                    if existing:
-                        existing.ca1_score = ca1_score
-                        existing.ca2_score = ca2_score
-                        existing.uploaded_by = request.user
-                        to_update.append(existing)
+                    # A later row for the same student/subject replaces the earlier one
+                    to_ingest[key] = CAScore(
+                        student=student, subject=subject,
+                        session=session, term=term,
+                        ca1_score=ca1_score, ca2_score=ca2_score,
+                        uploaded_by=request.user
+                    )
+                    if key in existing_keys:
                         updated += 1
                     else:
-                        new_obj = CAScore(
-                            student=student, subject=subject,
-                            session=session, term=term,
-                            ca1_score=ca1_score, ca2_score=ca2_score,
-                            uploaded_by=request.user
-                        )
-                        to_create.append(new_obj)
-                        # Track in existing_scores to handle duplicate rows in same CSV
-                        existing_scores[key] = new_obj
+                        existing_keys.add(key)
                         created += 1
 
                 except Exception as e:
                     errors.append({'row': idx, 'error': str(e)})
 
-            if to_create:
-                CAScore.objects.bulk_create(to_create)
-            if to_update:
-                CAScore.objects.bulk_update(to_update, ['ca1_score', 'ca2_score', 'uploaded_by'])
+            CAScore.objects.bulk_ingest(to_ingest.values(), CA_UPLOAD_FIELDS)
 
         invalidate_score_cache(session.id, term.id)
         logger.info(f"CA scores uploaded: {created} created, {updated} updated by {request.user.username}")
@@ -324,9 +307,7 @@ class ExamResultViewSet(viewsets.ModelViewSet):
     filterset_fields = ['student', 'subject', 'session', 'term']
     
     def get_queryset(self):
-        queryset = ExamResult.objects.select_related(
-            'student', 'student__class_level', 'subject', 'session', 'term', 'uploaded_by'
-        ).order_by('-uploaded_at')
+        queryset = ExamResult.objects.for_display().order_by('-uploaded_at')
         
         class_level = self.request.query_params.get('class_level')
         if class_level:
@@ -437,17 +418,13 @@ class ExamResultViewSet(viewsets.ModelViewSet):
 
         created, updated, subjects_created = 0, 0, 0
         missing_ca, errors = [], []
-        to_create = []
-        to_update = []
+        to_ingest = {}
 
         with transaction.atomic():
-            # Pre-fetch existing exam results and CA scores
-            existing_results = {
-                (r.student_id, r.subject_id): r
-                for r in ExamResult.objects.filter(
-                    session=session, term=term
-                ).select_for_update()
-            }
+            # Keys already stored (for the counts) and CA scores to copy across
+            existing_keys = set(
+                ExamResult.objects.filter(session=session, term=term).values_list('student_id', 'subject_id')
+            )
 
             ca_scores_map = {
                 (ca.student_id, ca.subject_id): ca
@@ -489,38 +466,26 @@ class ExamResultViewSet(viewsets.ModelViewSet):
                         missing_ca.append({'admission_number': admission_number, 'subject': subject_name})
 
                     key = (student.id, subject.id)
-                    existing = existing_results.get(key)
-
-                    if existing:
-                        existing.ca1_score = ca1_score
-                        existing.ca2_score = ca2_score
-                        existing.obj_score = obj_score
-                        existing.total_obj_questions = total_questions
-                        existing.uploaded_by = request.user
-                        to_update.append(existing)
+                    to_ingest[key] = ExamResult(
+                        student=student, subject=subject,
+                        session=session, term=term,
+                        ca1_score=ca1_score, ca2_score=ca2_score,
+                        obj_score=obj_score, total_obj_questions=total_questions,
+                        uploaded_by=request.user
+                    )
+                    if key in existing_keys:
                         updated += 1
                     else:
-                        new_obj = ExamResult(
-                            student=student, subject=subject,
-                            session=session, term=term,
-                            ca1_score=ca1_score, ca2_score=ca2_score,
-                            obj_score=obj_score, total_obj_questions=total_questions,
-                            uploaded_by=request.user
-                        )
-                        to_create.append(new_obj)
-                        existing_results[key] = new_obj
+                        existing_keys.add(key)
                         created += 1
 
                 except Exception as e:
                     errors.append({'row': idx, 'error': str(e)})
 
-            if to_create:
-                ExamResult.objects.bulk_create(to_create)
-            if to_update:
-                ExamResult.objects.bulk_update(
-                    to_update,
-                    ['ca1_score', 'ca2_score', 'obj_score', 'total_obj_questions', 'uploaded_by']
-                )
+            ExamResult.objects.bulk_ingest(
+                to_ingest.values(),
+                ['ca1_score', 'ca2_score', 'obj_score', 'total_obj_questions', 'uploaded_by']
+            )
 
         _recalculate_totals(session, term)
         _calculate_class_positions(session, term)
@@ -555,16 +520,12 @@ class ExamResultViewSet(viewsets.ModelViewSet):
 
         created, updated, subjects_created = 0, 0, 0
         errors = []
-        to_create = []
-        to_update = []
+        to_ingest = {}
 
         with transaction.atomic():
-            existing_results = {
-                (r.student_id, r.subject_id): r
-                for r in ExamResult.objects.filter(
-                    session=session, term=term
-                ).select_for_update()
-            }
+            existing_keys = set(
+                ExamResult.objects.filter(session=session, term=term).values_list('student_id', 'subject_id')
+            )
 
             ca_scores_map = {
                 (ca.student_id, ca.subject_id): ca
@@ -595,38 +556,31 @@ class ExamResultViewSet(viewsets.ModelViewSet):
                         subjects_created += 1
 
                     key = (student.id, subject.id)
-                    existing = existing_results.get(key)
 
-                    if existing:
-                        existing.theory_score = theory_score
-                        to_update.append(existing)
+                    # CA scores only seed new results; existing ones keep theirs
+                    ca1_score, ca2_score = Decimal('0'), Decimal('0')
+                    ca_obj = ca_scores_map.get(key)
+                    if ca_obj:
+                        ca1_score = ca_obj.ca1_score or Decimal('0')
+                        ca2_score = ca_obj.ca2_score or Decimal('0')
+
+                    to_ingest[key] = ExamResult(
+                        student=student, subject=subject,
+                        session=session, term=term,
+                        ca1_score=ca1_score, ca2_score=ca2_score,
+                        obj_score=Decimal('0'), theory_score=theory_score,
+                        uploaded_by=request.user
+                    )
+                    if key in existing_keys:
                         updated += 1
                     else:
-                        # Get CA scores if available
-                        ca1_score, ca2_score = Decimal('0'), Decimal('0')
-                        ca_obj = ca_scores_map.get(key)
-                        if ca_obj:
-                            ca1_score = ca_obj.ca1_score or Decimal('0')
-                            ca2_score = ca_obj.ca2_score or Decimal('0')
-
-                        new_obj = ExamResult(
-                            student=student, subject=subject,
-                            session=session, term=term,
-                            ca1_score=ca1_score, ca2_score=ca2_score,
-                            obj_score=Decimal('0'), theory_score=theory_score,
-                            uploaded_by=request.user
-                        )
-                        to_create.append(new_obj)
-                        existing_results[key] = new_obj
+                        existing_keys.add(key)
                         created += 1
 
                 except Exception as e:
                     errors.append({'row': idx, 'error': str(e)})
 
-            if to_create:
-                ExamResult.objects.bulk_create(to_create)
-            if to_update:
-                ExamResult.objects.bulk_update(to_update, ['theory_score'])
+            ExamResult.objects.bulk_ingest(to_ingest.values(), ['theory_score'])
 
         _recalculate_totals(session, term)
         _calculate_class_positions(session, term)
@@ -646,13 +600,14 @@ class ExamResultViewSet(viewsets.ModelViewSet):
 
         class_level_id = request.data.get('class_level')
         totals_fixed = _recalculate_totals(session, term)
-        subjects_processed = _calculate_class_positions(session, term, class_level_id)
+        results_ranked, subjects_processed = _calculate_class_positions(session, term, class_level_id)
         invalidate_score_cache(session.id, term.id)
 
         return Response({
             'success': True, 'message': 'Totals and positions recalculated',
             'totals_fixed': totals_fixed,
-            'subjects_processed': subjects_processed
+            'subjects_processed': subjects_processed,
+            'results_ranked': results_ranked
         })
     
     @action(detail=False, methods=['post'], url_path='sync-ca-scores')
@@ -742,16 +697,12 @@ def bulk_upload_ca_scores(request):
 
     created_count, updated_count, subjects_created = 0, 0, 0
     errors = []
-    to_create = []
-    to_update = []
+    to_ingest = {}
 
     with transaction.atomic():
-        existing_scores = {
-            (ca.student_id, ca.subject_id): ca
-            for ca in CAScore.objects.filter(
-                session=session, term=term
-            ).select_for_update()
-        }
+        existing_keys = set(
+            CAScore.objects.filter(session=session, term=term).values_list('student_id', 'subject_id')
+        )
 
         for idx, row in enumerate(rows, start=2):
             try:
@@ -782,32 +733,22 @@ def bulk_upload_ca_scores(request):
                     subjects_created += 1
 
                 key = (student.id, subject.id)
-                existing = existing_scores.get(key)
-
-                if existing:
-                    existing.ca1_score = ca1_score
-                    existing.ca2_score = ca2_score
-                    existing.uploaded_by = request.user
-                    to_update.append(existing)
+                to_ingest[key] = CAScore(
+                    student=student, subject=subject,
+                    session=session, term=term,
+                    ca1_score=ca1_score, ca2_score=ca2_score,
+                    uploaded_by=request.user
+                )
+                if key in existing_keys:
                     updated_count += 1
                 else:
-                    new_obj = CAScore(
-                        student=student, subject=subject,
-                        session=session, term=term,
-                        ca1_score=ca1_score, ca2_score=ca2_score,
-                        uploaded_by=request.user
-                    )
-                    to_create.append(new_obj)
-                    existing_scores[key] = new_obj
+                    existing_keys.add(key)
                     created_count += 1
 
             except Exception as e:
                 errors.append({'row': idx, 'admission_number': row.get('admission_number', 'N/A'), 'error': str(e)})
 
-        if to_create:
-            CAScore.objects.bulk_create(to_create)
-        if to_update:
-            CAScore.objects.bulk_update(to_update, ['ca1_score', 'ca2_score', 'uploaded_by'])
+        CAScore.objects.bulk_ingest(to_ingest.values(), CA_UPLOAD_FIELDS)
 
     invalidate_score_cache(session.id, term.id)
     logger.info(f"CA scores uploaded: {created_count} created, {updated_count} updated by {request.user.username}")
@@ -848,16 +789,12 @@ def bulk_upload_exam_results(request):
     created_count, updated_count, subjects_created = 0, 0, 0
     missing_ca_scores = []
     errors = []
-    to_create = []
-    to_update = []
+    to_ingest = {}
 
     with transaction.atomic():
-        existing_results = {
-            (r.student_id, r.subject_id): r
-            for r in ExamResult.objects.filter(
-                session=session, term=term
-            ).select_for_update()
-        }
+        existing_keys = set(
+            ExamResult.objects.filter(session=session, term=term).values_list('student_id', 'subject_id')
+        )
 
         ca_scores_map = {
             (ca.student_id, ca.subject_id): ca
@@ -911,38 +848,26 @@ def bulk_upload_exam_results(request):
                     missing_ca_scores.append({'admission_number': admission_number, 'subject': subject_name})
 
                 key = (student.id, subject.id)
-                existing = existing_results.get(key)
-
-                if existing:
-                    existing.ca1_score = ca1_score
-                    existing.ca2_score = ca2_score
-                    existing.obj_score = obj_score
-                    existing.theory_score = theory_score
-                    existing.uploaded_by = request.user
-                    to_update.append(existing)
+                to_ingest[key] = ExamResult(
+                    student=student, subject=subject,
+                    session=session, term=term,
+                    ca1_score=ca1_score, ca2_score=ca2_score,
+                    obj_score=obj_score, theory_score=theory_score,
+                    uploaded_by=request.user
+                )
+                if key in existing_keys:
                     updated_count += 1
                 else:
-                    new_obj = ExamResult(
-                        student=student, subject=subject,
-                        session=session, term=term,
-                        ca1_score=ca1_score, ca2_score=ca2_score,
-                        obj_score=obj_score, theory_score=theory_score,
-                        uploaded_by=request.user
-                    )
-                    to_create.append(new_obj)
-                    existing_results[key] = new_obj
+                    existing_keys.add(key)
                     created_count += 1
 
             except Exception as e:
                 errors.append({'row': idx, 'admission_number': row.get('admission_number', 'N/A'), 'error': str(e)})
 
-        if to_create:
-            ExamResult.objects.bulk_create(to_create)
-        if to_update:
-            ExamResult.objects.bulk_update(
-                to_update,
-                ['ca1_score', 'ca2_score', 'obj_score', 'theory_score', 'uploaded_by']
-            )
+        ExamResult.objects.bulk_ingest(
+            to_ingest.values(),
+            ['ca1_score', 'ca2_score', 'obj_score', 'theory_score', 'uploaded_by']
+        )
 
     _recalculate_totals(session, term)
     _calculate_class_positions(session, term)
@@ -968,9 +893,7 @@ def get_ca_scores(request):
     class_level = request.query_params.get('class_level')
     subject_id = request.query_params.get('subject_id')
     
-    queryset = CAScore.objects.select_related(
-        'student', 'student__class_level', 'subject', 'session', 'term'
-    ).all()
+    queryset = CAScore.objects.for_display().order_by('-created_at')
     
     if session_id:
         queryset = queryset.filter(session_id=session_id)
@@ -997,9 +920,7 @@ def get_exam_results(request):
     class_level = request.query_params.get('class_level')
     subject_id = request.query_params.get('subject_id')
     
-    queryset = ExamResult.objects.select_related(
-        'student', 'student__class_level', 'subject', 'session', 'term'
-    ).all()
+    queryset = ExamResult.objects.for_display().order_by('-uploaded_at')
     
     if session_id:
         queryset = queryset.filter(session_id=session_id)
@@ -1023,132 +944,70 @@ def get_exam_results(request):
 
 def _recalculate_totals(session, term):
     """
-    Recalculate total_score, grade, remark, and cumulative for all results
-    in a session/term. Optimized to avoid N+1 queries.
+    Recalculate cumulative scores for all results in a session/term.
+    total_score, grade and remark are generated columns kept current by
+    the database. Optimized to avoid N+1 queries; scores stay Decimal
+    throughout (no float/str round-trips).
     """
-    results = list(ExamResult.objects.filter(
-        session=session, term=term
-    ).select_related('term', 'student', 'subject'))
+    results = list(ExamResult.objects.filter(session=session, term=term))
     
     if not results:
         return 0
     
     # Pre-load ALL results for this session to avoid per-result DB queries
     all_session_results = ExamResult.objects.filter(
-        session=session
-    ).select_related('term').values_list(
-        'student_id', 'subject_id', 'term__name', 'total_score'
+        session=session, term__ordinal__in=(1, 2, 3)
+    ).values_list(
+        'student_id', 'subject_id', 'term__ordinal', 'total_score'
     )
     
-    # Build lookup: (student_id, subject_id) -> {term_name: total_score}
+    # Build lookup: (student_id, subject_id) -> {term_ordinal: total_score}
     cumulative_lookup = {}
-    for student_id, subject_id, term_name, total_score in all_session_results:
-        key = (student_id, subject_id)
-        if key not in cumulative_lookup:
-            cumulative_lookup[key] = {}
-        cumulative_lookup[key][term_name] = float(total_score or 0)
+    for student_id, subject_id, term_ordinal, total_score in all_session_results:
+        cumulative_lookup.setdefault((student_id, subject_id), {})[term_ordinal] = total_score or ZERO
     
+    current_ordinal = term.ordinal
     to_update = []
     
     for r in results:
-        new_total = (
-            (r.ca1_score or 0) +
-            (r.ca2_score or 0) +
-            (r.obj_score or 0) +
-            (r.theory_score or 0)
-        )
-        
-        needs_update = (r.total_score != new_total) or not r.grade
-        
-        if needs_update:
-            r.total_score = new_total
-            r.grade, r.remark = r.calculate_grade(r.total_score)
+        new_total = r.total_score or ZERO
         
         # Calculate cumulative without extra DB queries
-        key = (r.student_id, r.subject_id)
-        term_data = cumulative_lookup.get(key, {})
+        term_data = cumulative_lookup.get((r.student_id, r.subject_id), {})
         
-        # Override current term's score with freshly calculated total
-        current_term_name = r.term.name if r.term else ''
-        term_data[current_term_name] = float(new_total)
+        # Make sure the current term is represented
+        if TERM_TOTAL_FIELDS[current_ordinal]:
+            term_data[current_ordinal] = new_total
         
-        r.first_term_total = Decimal(str(term_data.get('First Term', 0))) if 'First Term' in term_data else None
-        r.second_term_total = Decimal(str(term_data.get('Second Term', 0))) if 'Second Term' in term_data else None
-        r.third_term_total = Decimal(str(term_data.get('Third Term', 0))) if 'Third Term' in term_data else None
+        for ordinal in (1, 2, 3):
+            setattr(r, TERM_TOTAL_FIELDS[ordinal], term_data.get(ordinal))
         
         # Calculate cumulative average
-        term_scores = [v for v in [
-            float(r.first_term_total) if r.first_term_total is not None else None,
-            float(r.second_term_total) if r.second_term_total is not None else None,
-            float(r.third_term_total) if r.third_term_total is not None else None,
-        ] if v is not None]
+        term_scores = [v for v in (term_data.get(1), term_data.get(2), term_data.get(3)) if v is not None]
         
         if term_scores:
-            r.cumulative_score = Decimal(str(round(sum(term_scores) / len(term_scores), 2)))
-            r.cumulative_grade, _ = r.calculate_grade(r.cumulative_score)
+            r.cumulative_score = (sum(term_scores) / len(term_scores)).quantize(TWO_PLACES)
         else:
             r.cumulative_score = new_total
-            r.cumulative_grade, _ = r.calculate_grade(new_total)
+        r.cumulative_grade, _ = r.calculate_grade(r.cumulative_score)
         
         to_update.append(r)
     
     if to_update:
-        ExamResult.objects.bulk_update(
-            to_update,
-            ['total_score', 'grade', 'remark',
-             'first_term_total', 'second_term_total', 'third_term_total',
-             'cumulative_score', 'cumulative_grade']
-        )
+        ExamResult.objects.bulk_update(to_update, CUMULATIVE_RESULT_FIELDS)
+    
+    # Report cards read cumulative averages from the materialized view
+    schedule_student_cumulative_refresh()
     
     return len(to_update)
 
 
 def _calculate_class_positions(session, term, class_level_id=None):
-    """Calculate positions within each class/subject combination."""
-    results_query = ExamResult.objects.filter(
-        session=session, term=term
-    ).select_related('student', 'student__class_level')
-    
-    if class_level_id:
-        results_query = results_query.filter(student__class_level_id=class_level_id)
-    
-    class_subject_groups = {}
-    for result in results_query:
-        if result.student.class_level_id:
-            key = (result.student.class_level_id, result.subject.id)
-            if key not in class_subject_groups:
-                class_subject_groups[key] = []
-            class_subject_groups[key].append(result)
-    
-    subjects_processed = 0
-    
-    for key, group_results in class_subject_groups.items():
-        sorted_results = sorted(group_results, key=lambda x: float(x.total_score or 0), reverse=True)
-        
-        total_students = len(sorted_results)
-        scores = [float(r.total_score or 0) for r in sorted_results]
-        avg_score = sum(scores) / total_students if total_students > 0 else 0
-        highest = max(scores) if scores else 0
-        lowest = min(scores) if scores else 0
-        
-        position, prev_score = 0, None
-        
-        for idx, result in enumerate(sorted_results):
-            current_score = float(result.total_score or 0)
-            if current_score != prev_score:
-                position = idx + 1
-                prev_score = current_score
-            
-            result.position = position
-            result.class_average = Decimal(str(round(avg_score, 2)))
-            result.total_students = total_students
-            result.highest_score = Decimal(str(highest))
-            result.lowest_score = Decimal(str(lowest))
-        
-        ExamResult.objects.bulk_update(
-            sorted_results,
-            ['position', 'class_average', 'total_students', 'highest_score', 'lowest_score']
-        )
-        subjects_processed += 1
+    """
+    Calculate positions and class statistics within each class/subject
+    combination (see ExamResult.recompute_rankings).
     
-    return subjects_processed
\ No newline at end of file
+    Returns (results ranked, class/subject groups processed), both read
+    from the ranking UPDATE itself.
+    """
+    return ExamResult.recompute_rankings(session.id, term.id, class_level_id)
\ No newline at end of file
@@ -7,15 +7,18 @@ import io
 import logging
 from datetime import datetime
 
+from django.db import DataError, IntegrityError
+from django.db.models import Count, Q
 from django.http import HttpResponse
-from rest_framework import status, viewsets, filters
+from django.utils import timezone
+from rest_framework import filters, serializers, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
-from ..models import ActiveStudent, AcademicSession, ClassLevel
+from ..models import ActiveStudent
 from ..serializers import (
     ActiveStudentSerializer,
     ActiveStudentWriteSerializer,
@@ -28,6 +31,8 @@ from ..cache_utils import (
     get_or_set_cache,
     invalidate_cache,
     invalidate_student_cache,
+    get_cached_class_levels,
+    get_cached_current_session,
     CACHE_TIMEOUT_STUDENT,
 )
 
@@ -54,7 +59,7 @@ class ActiveStudentViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsAdminOrSuperAdmin]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
     filter_backends = [filters.SearchFilter, DjangoFilterBackend, filters.OrderingFilter]
-    search_fields = ['admission_number', 'first_name', 'last_name', 'email']
+    search_fields = ['admission_number', 'full_name', 'email']
     filterset_fields = ['class_level', 'gender', 'is_active']
     ordering_fields = ['admission_number', 'first_name', 'created_at']
     ordering = ['admission_number']
@@ -67,9 +72,7 @@ class ActiveStudentViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Optimized queryset with select_related"""
-        return ActiveStudent.objects.select_related(
-            'class_level', 'enrollment_session', 'created_by'
-        ).prefetch_related('subjects')
+        return ActiveStudent.objects.for_list().without_credentials().with_subjects()
     
     def list(self, request, *args, **kwargs):
         """Return cached list of students"""
@@ -143,8 +146,9 @@ class ActiveStudentViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         """Soft delete student"""
         instance = self.get_object()
+        # Plain UPDATE - no save() hooks or signals needed to flip the flag
+        ActiveStudent.objects.filter(pk=instance.pk).update(is_active=False, updated_at=timezone.now())
         instance.is_active = False
-        instance.save(update_fields=['is_active'])
         
         invalidate_student_cache(
             student_id=instance.id,
@@ -167,12 +171,15 @@ class ActiveStudentViewSet(viewsets.ModelViewSet):
         cache_key = make_cache_key('student_stats')
         
         def get_stats():
-            total = ActiveStudent.objects.count()
-            active = ActiveStudent.objects.filter(is_active=True).count()
+            # Both counts in one scan of the table
+            counts = ActiveStudent.objects.aggregate(
+                total=Count('id'),
+                active=Count('id', filter=Q(is_active=True)),
+            )
             return {
-                'total': total,
-                'active': active,
-                'inactive': total - active
+                'total': counts['total'],
+                'active': counts['active'],
+                'inactive': counts['total'] - counts['active']
             }
         
         stats = get_or_set_cache(cache_key, get_stats, timeout=CACHE_TIMEOUT_STUDENT)
@@ -206,92 +213,112 @@ class ActiveStudentViewSet(viewsets.ModelViewSet):
         
         csv_file = request.FILES['file']
         
-        try:
-            decoded_file = csv_file.read().decode('utf-8-sig')  # utf-8-sig strips BOM
-        except UnicodeDecodeError:
-            return Response(
-                {'error': 'Invalid file encoding. Please save CSV as UTF-8.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        io_string = io.StringIO(decoded_file)
-        reader = csv.DictReader(io_string)
-        
-        # Clean column headers (strip whitespace)
-        if reader.fieldnames:
-            reader.fieldnames = [f.strip() for f in reader.fieldnames]
-        
-        created_students = []
+        to_enroll = []
         errors = []
         row_num = 1
         
         # Get current session
-        session = AcademicSession.objects.filter(is_current=True).first()
+        session = get_cached_current_session()
         if not session:
             return Response(
                 {'error': 'No current academic session set.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        for row in reader:
-            row_num += 1
-            try:
-                # Clean all values: strip whitespace
-                cleaned_row = {k.strip(): v.strip() if isinstance(v, str) else v for k, v in row.items() if k}
-                
-                # Normalize: class_level and gender to uppercase
-                if 'class_level' in cleaned_row:
-                    cleaned_row['class_level'] = cleaned_row['class_level'].upper()
-                if 'gender' in cleaned_row:
-                    cleaned_row['gender'] = cleaned_row['gender'].upper()
-                
-                # Title case names for consistency
-                for name_field in ['first_name', 'middle_name', 'last_name', 'parent_name']:
-                    if name_field in cleaned_row and cleaned_row[name_field]:
-                        cleaned_row[name_field] = cleaned_row[name_field].strip().title()
-                
-                serializer = StudentBulkUploadSerializer(data=cleaned_row)
-                if not serializer.is_valid():
-                    errors.append({
-                        'row': row_num,
-                        'error': f"Validation failed: {serializer.errors}"
-                    })
-                    continue
-                
-                class_level_name = serializer.validated_data['class_level'].upper()
+        # Resolve class levels per row from the cached lookup table
+        class_levels = {cl.name: cl for cl in get_cached_class_levels()}
+        
+        # Decode the upload as it is read rather than holding the raw bytes
+        # and the decoded text in memory at once. utf-8-sig strips BOM.
+        reader = csv.DictReader(io.TextIOWrapper(csv_file.file, encoding='utf-8-sig', newline=''))
+        # One serializer validates every row; only its errors are per row
+        row_serializer = StudentBulkUploadSerializer()
+        
+        try:
+            # Clean column headers (strip whitespace)
+            if reader.fieldnames:
+                reader.fieldnames = [f.strip() for f in reader.fieldnames]
+            
+            for row in reader:
+                row_num += 1
                 try:
-                    class_level = ClassLevel.objects.get(name=class_level_name)
-                except ClassLevel.DoesNotExist:
-                    errors.append({
-                        'row': row_num,
-                        'error': f"Invalid class level '{class_level_name}'"
-                    })
-                    continue
-                
-                student = ActiveStudent(
-                    first_name=serializer.validated_data['first_name'].strip(),
-                    middle_name=serializer.validated_data.get('middle_name', '').strip() or None,
-                    last_name=serializer.validated_data['last_name'].strip(),
-                    date_of_birth=serializer.validated_data.get('date_of_birth'),
-                    gender=serializer.validated_data['gender'],
-                    class_level=class_level,
-                    enrollment_session=session,
-                    email=serializer.validated_data.get('email'),
-                    phone_number=serializer.validated_data.get('phone_number', '').strip() or None,
-                    parent_name=serializer.validated_data.get('parent_name', '').strip() or None,
-                    parent_email=serializer.validated_data.get('parent_email', '').strip() or None,
-                    parent_phone=serializer.validated_data.get('parent_phone', '').strip() or None,
-                    address=serializer.validated_data.get('address', '').strip() or None,
-                    state_of_origin=serializer.validated_data.get('state_of_origin', '').strip() or None,
-                    local_govt_area=serializer.validated_data.get('local_govt_area', '').strip() or None,
-                    is_active=True,
-                    created_by=request.user,
-                )
-                student.save()
-                created_students.append(student.admission_number)
+                    # Clean all values: strip whitespace
+                    cleaned_row = {k.strip(): v.strip() if isinstance(v, str) else v for k, v in row.items() if k}
+                    
+                    # Normalize: class_level and gender to uppercase
+                    if 'class_level' in cleaned_row:
+                        cleaned_row['class_level'] = cleaned_row['class_level'].upper()
+                    if 'gender' in cleaned_row:
+                        cleaned_row['gender'] = cleaned_row['gender'].upper()
+                    
+                    # Title case names for consistency
+                    for name_field in ['first_name', 'middle_name', 'last_name', 'parent_name']:
+                        if name_field in cleaned_row and cleaned_row[name_field]:
+                            cleaned_row[name_field] = cleaned_row[name_field].strip().title()
+                    
+                    try:
+                        validated_data = row_serializer.run_validation(cleaned_row)
+                    except serializers.ValidationError as exc:
+                        errors.append({
+                            'row': row_num,
+                            'error': f"Validation failed: {exc.detail}"
+                        })
+                        continue
+                    
+                    class_level_name = validated_data['class_level'].upper()
+                    class_level = class_levels.get(class_level_name)
+                    if class_level is None:
+                        errors.append({
+                            'row': row_num,
+                            'error': f"Invalid class level '{class_level_name}'"
+                        })
+                        continue
+                    
+                    student = ActiveStudent(
+                        first_name=validated_data['first_name'].strip(),
+                        middle_name=validated_data.get('middle_name', '').strip() or None,
+                        last_name=validated_data['last_name'].strip(),
+                        date_of_birth=validated_data.get('date_of_birth'),
+                        gender=validated_data['gender'],
+                        class_level=class_level,
+                        enrollment_session=session,
+                        email=validated_data.get('email'),
+                        phone_number=validated_data.get('phone_number', '').strip() or None,
+                        parent_name=validated_data.get('parent_name', '').strip() or None,
+                        parent_email=validated_data.get('parent_email', '').strip() or None,
+                        parent_phone=validated_data.get('parent_phone', '').strip() or None,
+                        address=validated_data.get('address', '').strip() or None,
+                        state_of_origin=validated_data.get('state_of_origin', '').strip() or None,
+                        local_govt_area=validated_data.get('local_govt_area', '').strip() or None,
+                        is_active=True,
+                        created_by=request.user,
+                    )
+                    to_enroll.append(student)
                 
-            except Exception as e:
-                errors.append({'row': row_num, 'error': str(e)})
+                except Exception as e:
+                    errors.append({'row': row_num, 'error': str(e)})
+        
+        except UnicodeDecodeError:
+            return Response(
+                {'error': 'Invalid file encoding. Please save CSV as UTF-8.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Admission numbers, passwords and hashes are assigned in one pass.
+        # The insert is atomic: on failure no row of the file is enrolled.
+        try:
+            created_students = [
+                student.admission_number for student in ActiveStudent.objects.bulk_enroll(to_enroll)
+            ]
+        except (IntegrityError, DataError) as e:
+            logger.error(f"Bulk upload enrollment failed: {e}")
+            return Response({
+                'error': f'Enrollment failed, no students were created: {e}',
+                'created': 0,
+                'students': [],
+                'errors': errors[:10] if errors else [],
+                'total_errors': len(errors),
+            }, status=status.HTTP_400_BAD_REQUEST)
         
         # Invalidate student cache
         invalidate_student_cache()
@@ -319,9 +346,8 @@ class ActiveStudentViewSet(viewsets.ModelViewSet):
             'parent_phone', 'address', 'state_of_origin', 'local_govt_area'
         ])
         
-        students = ActiveStudent.objects.select_related(
-            'class_level', 'enrollment_session'
-        ).all()
+        # Stream rows into the response instead of caching the whole table
+        students = ActiveStudent.objects.for_list().without_credentials().iterator(chunk_size=2000)
         
         for student in students:
             writer.writerow([
@@ -358,7 +384,7 @@ class ActiveStudentViewSet(viewsets.ModelViewSet):
         """
         class_level_name = request.query_params.get('class_level')
         
-        students = ActiveStudent.objects.filter(is_active=True).select_related('class_level')
+        students = ActiveStudent.objects.filter(is_active=True)
         
         if class_level_name:
             students = students.filter(class_level__name=class_level_name)
@@ -374,15 +400,14 @@ class ActiveStudentViewSet(viewsets.ModelViewSet):
             'class_level', 'password_plain'
         ])
         
-        for student in students.order_by('class_level__name', 'last_name', 'first_name'):
-            writer.writerow([
-                student.admission_number,
-                student.first_name,
-                student.middle_name or '',
-                student.last_name,
-                student.class_level.name if student.class_level else '',
-                student.password_plain or '',
-            ])
+        # Plain tuples straight from the cursor: no model instance per row
+        rows = students.order_by('class_level__name', 'last_name', 'first_name').values_list(
+            'admission_number', 'first_name', 'middle_name', 'last_name',
+            'class_level__name', 'password_plain',
+        )
+        for row in rows.iterator(chunk_size=2000):
+            # middle_name, class_level and password_plain may be NULL
+            writer.writerow(['' if value is None else value for value in row])
         
         return response
     
@@ -407,11 +432,15 @@ class ActiveStudentViewSet(viewsets.ModelViewSet):
         promoted = 0
         graduated = 0
         errors = []
+        class_levels = get_cached_class_levels()
+        class_levels_by_id = {cl.id: cl for cl in class_levels}
+        class_levels_by_order = {cl.order: cl for cl in class_levels}
         
         for student_id in student_ids:
             try:
                 student = ActiveStudent.objects.get(id=student_id)
-                current_order = student.class_level.order if student.class_level else 0
+                current_class = class_levels_by_id.get(student.class_level_id)
+                current_order = current_class.order if current_class else 0
                 
                 if current_order >= 6:  # SS3
                     student.is_active = False
@@ -419,7 +448,7 @@ class ActiveStudentViewSet(viewsets.ModelViewSet):
                     student.save()
                     graduated += 1
                 else:
-                    next_class = ClassLevel.objects.filter(order=current_order + 1).first()
+                    next_class = class_levels_by_order.get(current_order + 1)
                     if next_class:
                         student.class_level = next_class
                         student.save()